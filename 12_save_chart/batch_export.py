@@ -0,0 +1,202 @@
+"""Batch chart export: render many chart specs to files in parallel
+
+Each spec is a plain dict describing one chart, for example the pie chart
+from the savefig notebook:
+
+    {
+        "name": "expenses",
+        "kind": "pie",
+        "data": {"values": [1400, 600, 300, 410, 250],
+                 "labels": ["Home Rent", "Food", "Phone/Internet Bill", "Car ", "Other Utilities"]},
+        "options": {"radius": 2, "autopct": "%0.1f%%", "explode": [0, 0.1, 0.1, 0, 0]},
+        "formats": ["png", "pdf"],
+        "savefig": {"bbox_inches": "tight", "pad_inches": 1, "transparent": True},
+    }
+
+Charts are drawn with the object-oriented API on Agg canvases (no pyplot
+global state) in a process pool. A spec whose content hash matches the
+previous run, and whose files still exist, is skipped.
+
+Run ``python batch_export.py [output_dir]`` to export the per-region,
+per-season charts of the climate dataset.
+"""
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+# Bump when rendering changes so every chart is redrawn
+RENDER_VERSION = 1
+MANIFEST = '.export_manifest.json'
+FORMATS = ('png', 'pdf', 'svg')
+DEFAULT_SAVEFIG = {'bbox_inches': 'tight'}
+
+
+def spec_hash(spec):
+    """Stable content hash of a chart spec"""
+    payload = json.dumps([RENDER_VERSION, spec], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _draw(ax, kind, data, options):
+    if kind == 'pie':
+        ax.pie(data['values'], labels=data.get('labels'), **options)
+    elif kind == 'bar':
+        ax.bar(data['x'], data['y'], **options)
+    elif kind == 'barh':
+        ax.barh(data['y'], data['x'], **options)
+    elif kind == 'line':
+        for series in data['series']:
+            ax.plot(series['x'], series['y'], label=series.get('label'), **options)
+        if any(s.get('label') for s in data['series']):
+            ax.legend(loc='best')
+    elif kind == 'hist':
+        ax.hist(data['values'], **options)
+    elif kind == 'box':
+        ax.boxplot(data['values'], **options)
+    elif kind == 'scatter':
+        ax.scatter(data['x'], data['y'], **options)
+    else:
+        raise ValueError(f"Unknown chart kind {kind!r}")
+
+
+def render_chart(spec, output_dir):
+    """Render one spec to every requested format; returns the written paths"""
+    fig = Figure(figsize=spec.get('figsize', (6.4, 4.8)))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    _draw(ax, spec['kind'], spec['data'], spec.get('options', {}))
+
+    if 'title' in spec:
+        ax.set_title(spec['title'])
+    if 'xlabel' in spec:
+        ax.set_xlabel(spec['xlabel'])
+    if 'ylabel' in spec:
+        ax.set_ylabel(spec['ylabel'])
+
+    savefig = dict(DEFAULT_SAVEFIG, **spec.get('savefig', {}))
+    paths = []
+    for fmt in spec.get('formats', ['png']):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unsupported format {fmt!r}; expected one of {FORMATS}")
+        path = os.path.join(output_dir, f"{spec['name']}.{fmt}")
+        fig.savefig(path, format=fmt, **savefig)
+        paths.append(path)
+    return paths
+
+
+def _render_job(spec, output_dir):
+    start = time.perf_counter()
+    try:
+        files = render_chart(spec, output_dir)
+        return {'name': spec['name'], 'status': 'rendered', 'files': files,
+                'seconds': time.perf_counter() - start}
+    except Exception as exc:
+        return {'name': spec['name'], 'status': 'failed', 'files': [],
+                'seconds': time.perf_counter() - start, 'error': f'{type(exc).__name__}: {exc}'}
+
+
+def _load_manifest(output_dir):
+    try:
+        with open(os.path.join(output_dir, MANIFEST)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(output_dir, manifest):
+    path = os.path.join(output_dir, MANIFEST)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(path + '.tmp', path)
+
+
+def export_charts(specs, output_dir, processes=None, force=False):
+    """Render ``specs`` into ``output_dir`` using a process pool
+
+    Returns one result dict per spec with ``name``, ``status`` ('rendered',
+    'skipped' or 'failed'), ``files`` and ``seconds``.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    names = [spec['name'] for spec in specs]
+    if len(set(names)) != len(names):
+        raise ValueError("Chart spec names must be unique")
+
+    manifest = _load_manifest(output_dir)
+    results, pending, hashes = {}, [], {}
+    for spec in specs:
+        digest = hashes[spec['name']] = spec_hash(spec)
+        previous = manifest.get(spec['name'])
+        if (not force and previous and previous['hash'] == digest
+                and all(os.path.exists(p) for p in previous['files'])):
+            results[spec['name']] = {'name': spec['name'], 'status': 'skipped',
+                                     'files': previous['files'], 'seconds': 0.0}
+        else:
+            pending.append(spec)
+
+    if len(pending) == 1 or processes == 1:
+        rendered = [_render_job(spec, output_dir) for spec in pending]
+    elif pending:
+        workers = processes or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunksize = max(1, len(pending) // (4 * workers))
+            rendered = list(pool.map(_render_job, pending, [output_dir] * len(pending),
+                                     chunksize=chunksize))
+    else:
+        rendered = []
+
+    for result in rendered:
+        results[result['name']] = result
+        if result['status'] == 'rendered':
+            manifest[result['name']] = {'hash': hashes[result['name']], 'files': result['files']}
+        else:
+            manifest.pop(result['name'], None)
+
+    _save_manifest(output_dir, manifest)
+    return [results[name] for name in names]
+
+
+def climate_specs(df):
+    """Per-region, per-season energy histograms and a season pie per region"""
+    specs = []
+    for region, by_region in df.groupby('region', observed=True):
+        for season, group in by_region.groupby('season', observed=True):
+            specs.append({
+                'name': f'energy_{region}_{season}'.lower(),
+                'kind': 'hist',
+                'data': {'values': group['energy_kwh'].round(2).tolist()},
+                'options': {'bins': 20, 'color': '#1f77b4', 'edgecolor': 'white'},
+                'title': f'Daily Energy Use - {region}, {season}',
+                'xlabel': 'Energy (kWh)',
+                'ylabel': 'Days',
+                'formats': ['png', 'svg'],
+            })
+        totals = by_region.groupby('season', observed=True)['energy_kwh'].sum()
+        specs.append({
+            'name': f'season_share_{region}'.lower(),
+            'kind': 'pie',
+            'data': {'values': totals.round(2).tolist(), 'labels': [str(s) for s in totals.index]},
+            'options': {'autopct': '%0.1f%%', 'startangle': 90},
+            'title': f'Energy by Season - {region}',
+            'formats': ['png', 'pdf'],
+            'savefig': {'bbox_inches': 'tight', 'pad_inches': 0.5},
+        })
+    return specs
+
+
+if __name__ == '__main__':
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from course_data import load_csv
+
+    output_dir = sys.argv[1] if len(sys.argv) > 1 else 'exported_charts'
+    start = time.perf_counter()
+    results = export_charts(climate_specs(load_csv('climate_energy_morocco_5years.csv')), output_dir)
+    for r in results:
+        print(f"{r['name']:<32}{r['status']:<10}{r['seconds'] * 1e3:>9.1f} ms  {r.get('error', '')}")
+    counts = {s: sum(r['status'] == s for r in results) for s in ('rendered', 'skipped', 'failed')}
+    print(f"{counts} in {time.perf_counter() - start:.2f} s")
@@ -7,6 +7,7 @@ max_t=[50,51,52,48,47,49,46]
 min_t=[43,42,40,44,33,35,37]
 avg_t=[45,48,48,46,40,42,41]
 
+# One line per series: plotting them again would stack duplicate artists
 plt.plot(days, max_t, label="max")
 plt.plot(days, min_t, label="min")
 plt.plot(days, avg_t, label="average")
@@ -19,30 +20,8 @@ plt.ylabel('Temperature')
 plt.title('Weather')
 
 
-plt.plot(days, max_t, label="max")
-plt.plot(days, min_t, label="min")
-plt.plot(days, avg_t, label="average")
-
-
-# Show legend
-plt.plot(days, max_t, label="max")
-plt.plot(days, min_t, label="min")
-plt.plot(days, avg_t, label="average")
-
-plt.legend(loc='best')
-
-# Legend at different location with shadow enabled and fontsize set to large
-plt.plot(days, max_t, label="max")
-plt.plot(days, min_t, label="min")
-plt.plot(days, avg_t, label="average")
-
-plt.legend(loc='upper right',shadow=True,fontsize='large')
-
-
-
-plt.plot(days, max_t, label="max")
-plt.plot(days, min_t, label="min")
-plt.plot(days, avg_t, label="average")
-
+# Show legend at a fixed location with shadow enabled and fontsize set to large
 plt.legend(loc='upper right', fontsize="large",shadow=True)
-plt.grid()
\ No newline at end of file
+plt.grid()
+
+# For data that refreshes live, see LiveLineChart in live_lines.py
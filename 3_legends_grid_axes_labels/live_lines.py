@@ -0,0 +1,183 @@
+"""Live line charts that reuse their artists and redraw with blitting
+
+``legend.py`` draws the chart by calling ``plt.plot`` for every series each
+time, so every redraw repaints a growing pile of identical lines. For a
+monitor that refreshes every second, ``LiveLineChart`` instead:
+
+* creates one ``Line2D`` per series, once, and updates it with ``set_data``,
+* renders the static parts (axes, grid, labels, title, legend) once and keeps
+  them as a cached background (``copy_from_bbox``),
+* per frame restores that background and draws only the lines, then blits.
+
+Series with more points than the axes has pixel columns are drawn from a
+min/max envelope per column (``decimate``), which looks the same on screen
+but keeps the per-frame cost bounded by the chart width.
+
+The background is re-captured only when the axis limits must grow to fit new
+data or the canvas is resized.
+
+Run ``python live_lines.py`` for a simulated temperature monitor.
+"""
+import numpy as np
+
+
+def decimate(x, y, buckets):
+    """Keep the first, lowest, highest and last point of ``buckets`` equal runs of sorted ``x``
+
+    With one bucket per pixel column the line through these points covers
+    the same pixels as the full series.
+    """
+    n = len(x)
+    if buckets <= 0 or n <= 4 * buckets:
+        return x, y
+    size = -(-n // buckets)
+    runs = np.pad(y, (0, buckets * size - n), mode='edge').reshape(buckets, size)
+    starts = np.arange(0, buckets * size, size)
+    picks = np.concatenate([
+        starts,
+        starts + np.argmin(np.where(np.isnan(runs), np.inf, runs), axis=1),
+        starts + np.argmax(np.where(np.isnan(runs), -np.inf, runs), axis=1),
+        starts + size - 1,
+    ])
+    picks = np.unique(np.minimum(picks, n - 1))
+    return x[picks], y[picks]
+
+
+class LiveLineChart:
+    """One reusable, blitted line per series on ``ax``"""
+
+    def __init__(self, ax, labels, title=None, xlabel=None, ylabel=None,
+                 legend_kw=None, grid=True, margin=0.05, decimate=True):
+        self.ax = ax
+        self.figure = ax.figure
+        self.canvas = ax.figure.canvas
+        self.margin = margin
+        self.decimate = decimate
+        self.background = None
+        self.full_redraws = 0
+
+        self.lines = [ax.plot([], [], label=label, animated=True)[0] for label in labels]
+        if title:
+            ax.set_title(title)
+        if xlabel:
+            ax.set_xlabel(xlabel)
+        if ylabel:
+            ax.set_ylabel(ylabel)
+        if grid:
+            ax.grid()
+        # A fixed location: 'best' would have to re-measure the data every frame
+        ax.legend(**dict({'loc': 'upper right'}, **(legend_kw or {})))
+
+        self._draw_cid = self.canvas.mpl_connect('draw_event', self._capture_background)
+
+    def _capture_background(self, event=None):
+        """Cache everything except the lines; runs after every full draw (e.g. resize)"""
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_lines()
+
+    def _draw_lines(self):
+        for line in self.lines:
+            self.ax.draw_artist(line)
+
+    def _fit_limits(self, x, ys):
+        """Grow the axis limits to fit the data; returns whether they changed"""
+        finite = [y[np.isfinite(y)] for y in ys if len(y)]
+        finite = [y for y in finite if len(y)]
+        if len(x) == 0 or not finite:
+            return False
+        x_low, x_high = float(np.min(x)), float(np.max(x))
+        y_low = min(float(y.min()) for y in finite)
+        y_high = max(float(y.max()) for y in finite)
+
+        changed = False
+        (x0, x1), (y0, y1) = self.ax.get_xlim(), self.ax.get_ylim()
+        if self.background is None or x_low < x0 or x_high > x1:
+            pad = (x_high - x_low) * self.margin or 1.0
+            self.ax.set_xlim(x_low - pad, x_high + pad)
+            changed = True
+        if self.background is None or y_low < y0 or y_high > y1:
+            pad = (y_high - y_low) * self.margin or 1.0
+            self.ax.set_ylim(y_low - pad, y_high + pad)
+            changed = True
+        return changed
+
+    def update(self, x, ys):
+        """Show new data: ``ys`` holds one y array per series, in label order
+
+        ``x`` must be sorted when decimation is on.
+        """
+        x = np.asarray(x)
+        ys = [np.asarray(y) for y in ys]
+        if len(ys) != len(self.lines):
+            raise ValueError(f"Expected {len(self.lines)} series, got {len(ys)}")
+        buckets = int(self.ax.bbox.width) if self.decimate else 0
+        for line, y in zip(self.lines, ys):
+            line.set_data(*decimate(x, y, buckets))
+
+        if self._fit_limits(x, ys):
+            # New limits invalidate the cached background: one full draw re-captures it
+            self.full_redraws += 1
+            self.canvas.draw()
+            return
+
+        self.canvas.restore_region(self.background)
+        self._draw_lines()
+        self.canvas.blit(self.figure.bbox)
+        self.canvas.flush_events()
+
+    def start(self, fetch, interval_ms=1000):
+        """Call ``fetch() -> (x, ys)`` every ``interval_ms`` and show the result"""
+        timer = self.canvas.new_timer(interval=interval_ms)
+        timer.add_callback(lambda: self.update(*fetch()))
+        timer.start()
+        return timer
+
+    def close(self):
+        self.canvas.mpl_disconnect(self._draw_cid)
+
+
+def replot_frame(ax, x, ys, labels, title=None, xlabel=None, ylabel=None, legend_kw=None, grid=True):
+    """The full-redraw path: rebuild every artist of the chart, then draw the whole figure"""
+    ax.cla()
+    for y, label in zip(ys, labels):
+        ax.plot(x, y, label=label)
+    if title:
+        ax.set_title(title)
+    if xlabel:
+        ax.set_xlabel(xlabel)
+    if ylabel:
+        ax.set_ylabel(ylabel)
+    if grid:
+        ax.grid()
+    ax.legend(**dict({'loc': 'upper right'}, **(legend_kw or {})))
+    ax.figure.canvas.draw()
+
+
+class TemperatureFeed:
+    """Simulated sensor: each call appends ``step`` readings of max, min and average"""
+
+    def __init__(self, step=10, seed=0):
+        self.step = step
+        self.rng = np.random.default_rng(seed)
+        self.x = np.empty(0)
+        self.ys = [np.empty(0) for _ in range(3)]
+
+    def __call__(self):
+        start = len(self.x)
+        x = np.arange(start, start + self.step, dtype=np.float64)
+        avg = 45 + 4 * np.sin(x / 50) + self.rng.normal(0, 0.5, self.step)
+        spread = np.abs(self.rng.normal(4, 1, self.step))
+        self.x = np.concatenate([self.x, x])
+        for i, values in enumerate((avg + spread, avg - spread, avg)):
+            self.ys[i] = np.concatenate([self.ys[i], values])
+        return self.x, self.ys
+
+
+if __name__ == '__main__':
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots()
+    chart = LiveLineChart(ax, ['max', 'min', 'average'], title='Weather', xlabel='Day',
+                          ylabel='Temperature', legend_kw={'fontsize': 'large', 'shadow': True})
+    timer = chart.start(TemperatureFeed(), interval_ms=1000)
+    plt.show()
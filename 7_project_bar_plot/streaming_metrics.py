@@ -0,0 +1,246 @@
+"""Incremental rolling, cumulative and churn metrics for the SaaS users table
+
+solutions.ipynb recomputes ``df[col].rolling(7, min_periods=1).mean()`` over
+the whole frame on every run. ``SaasMetrics`` keeps, per input column, a ring
+buffer of the last ``max(windows)`` values plus running totals, so appending
+a batch of daily rows costs O(batch + window) whatever the history length,
+and only the metrics of the new rows are returned:
+
+* ``<name>_ma<w>`` rolling means for every window ``w`` (pandas ``min_periods=1`` semantics),
+* ``net_growth``, ``cum_new_users``, ``cum_churned_users``, ``cum_net_growth``,
+* ``churn_rate`` (churned / active) and ``churn_rate_ma<w>`` over each window,
+* ``retention_ratio`` (active / new, clipped at 10, as in the notebook).
+
+``LiveSaasCharts`` appends those rows to the notebook's two figures (moving
+averages, and net-growth bars with the total-users line) without redrawing
+the history.
+
+Run ``python streaming_metrics.py`` to replay the CSV ten days at a time.
+"""
+import numpy as np
+import pandas as pd
+
+# Input column -> metric prefix, matching the notebook (churned_users -> churned_ma7)
+COLUMNS = {'new_users': 'new_users', 'active_users': 'active_users', 'churned_users': 'churned'}
+
+
+class RingBuffer:
+    """The last ``size`` values of a stream, oldest first via ``tail``"""
+
+    def __init__(self, size):
+        self.size = size
+        self.values = np.full(size, np.nan)
+        self.head = 0
+        self.count = 0
+
+    def tail(self, n):
+        """The most recent ``min(n, count)`` values in arrival order"""
+        n = min(n, self.count, self.size)
+        index = (self.head - n + np.arange(n)) % self.size
+        return self.values[index]
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=np.float64)[-self.size:]
+        index = (self.head + np.arange(len(values))) % self.size
+        self.values[index] = values
+        self.head = (self.head + len(values)) % self.size
+        self.count += len(values)
+
+
+class RollingSums:
+    """Rolling sums and non-NaN counts over several windows of one column"""
+
+    def __init__(self, windows):
+        self.windows = sorted(set(windows))
+        self.buffer = RingBuffer(max(self.windows) - 1 or 1)
+
+    def append(self, values):
+        """``{window: (sums, counts)}`` for each new value; O(len(values) + max window)"""
+        values = np.asarray(values, dtype=np.float64)
+        history = self.buffer.tail(max(self.windows) - 1)
+        extended = np.concatenate([history, values])
+        valid = ~np.isnan(extended)
+        sums = np.concatenate([[0.0], np.cumsum(np.where(valid, extended, 0.0))])
+        counts = np.concatenate([[0], np.cumsum(valid)])
+
+        end = len(history) + 1 + np.arange(len(values))
+        result = {}
+        for window in self.windows:
+            start = np.maximum(end - window, 0)
+            result[window] = (sums[end] - sums[start], counts[end] - counts[start])
+        self.buffer.extend(values)
+        return result
+
+
+class SaasMetrics:
+    """Streaming metrics stage fed with daily ``saas_users`` rows in date order"""
+
+    def __init__(self, windows=(7,), columns=COLUMNS):
+        self.windows = sorted(set(windows))
+        self.columns = dict(columns)
+        self.rolling = {column: RollingSums(self.windows) for column in self.columns}
+        self.totals = {'new_users': 0.0, 'churned_users': 0.0}
+        self.last_date = None
+        self.rows = 0
+
+    def append(self, rows):
+        """Fold a batch of new daily rows in and return their metrics as a frame"""
+        if len(rows) == 0:
+            return pd.DataFrame()
+        dates = pd.to_datetime(rows['date']).to_numpy()
+        if (np.diff(dates) < np.timedelta64(0)).any() or (self.last_date is not None and dates[0] <= self.last_date):
+            raise ValueError("Rows must arrive in date order, after the last appended date")
+
+        out = {'date': dates}
+        sums = {}
+        for column, prefix in self.columns.items():
+            sums[column] = self.rolling[column].append(rows[column].to_numpy(dtype=np.float64))
+            for window, (total, count) in sums[column].items():
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    out[f'{prefix}_ma{window}'] = total / count
+
+        new = rows['new_users'].to_numpy(dtype=np.float64)
+        churned = rows['churned_users'].to_numpy(dtype=np.float64)
+        active = rows['active_users'].to_numpy(dtype=np.float64)
+        cum_new = self.totals['new_users'] + np.nancumsum(new)
+        cum_churned = self.totals['churned_users'] + np.nancumsum(churned)
+        self.totals = {'new_users': cum_new[-1], 'churned_users': cum_churned[-1]}
+
+        out['net_growth'] = new - churned
+        out['cum_new_users'] = cum_new
+        out['cum_churned_users'] = cum_churned
+        out['cum_net_growth'] = cum_new - cum_churned
+        if 'total_users' in rows:
+            out['total_users'] = rows['total_users'].to_numpy()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            out['churn_rate'] = np.where(active > 0, churned / active, np.nan)
+            for window in self.windows:
+                active_sum = sums['active_users'][window][0]
+                out[f'churn_rate_ma{window}'] = np.where(active_sum > 0, sums['churned_users'][window][0] / active_sum, np.nan)
+            retention = active / new
+        out['retention_ratio'] = np.clip(np.where(np.isinf(retention), np.nan, retention), None, 10)
+
+        self.last_date = dates[-1]
+        self.rows += len(rows)
+        return pd.DataFrame(out, index=rows.index)
+
+
+class GrowingSeries:
+    """Append-only x/y arrays with amortized O(1) appends, exposed as views"""
+
+    def __init__(self, capacity=256):
+        self._x = np.empty(capacity)
+        self._y = np.empty(capacity)
+        self.size = 0
+
+    def extend(self, x, y):
+        n = self.size + len(x)
+        if n > len(self._x):
+            capacity = max(n, 2 * len(self._x))
+            self._x = np.resize(self._x, capacity)
+            self._y = np.resize(self._y, capacity)
+        self._x[self.size:n] = x
+        self._y[self.size:n] = y
+        self.size = n
+
+    @property
+    def x(self):
+        return self._x[:self.size]
+
+    @property
+    def y(self):
+        return self._y[:self.size]
+
+
+class LiveSaasCharts:
+    """The notebook's two SaaS figures, extended with each batch of new metric rows"""
+
+    def __init__(self, window=7):
+        import matplotlib.dates as mdates
+        import matplotlib.pyplot as plt
+
+        self.window = window
+        self._date2num = mdates.date2num
+
+        self.trend_fig, ax = plt.subplots(figsize=(14, 7))
+        ax2 = ax.twinx()
+        self.trend_axes = (ax, ax2)
+        self.trend_lines = {
+            f'new_users_ma{window}': ax.plot([], [], linewidth=2.5, label=f"New Users (MA{window})")[0],
+            f'active_users_ma{window}': ax.plot([], [], linewidth=2.5, label=f"Active Users (MA{window})")[0],
+            f'churned_ma{window}': ax2.plot([], [], linewidth=2.0, linestyle="--", label=f"Churned (MA{window})", alpha=0.8)[0],
+        }
+        ax.set_title(f"SaaS Growth Dashboard — New, Active & Churn ({window}-day MA)")
+        ax.set_ylabel("Users (New/Active)")
+        ax2.set_ylabel("Users (Churn)")
+
+        self.growth_fig, bx = plt.subplots(figsize=(14, 7))
+        bx2 = bx.twinx()
+        self.growth_axes = (bx, bx2)
+        self.total_line = bx2.plot([], [], linewidth=2.5, label="Total Users (Cumulative)")[0]
+        self.bar_label = "Net Daily Growth (New − Churn)"
+        bx.set_title("Total Users vs Net Growth")
+        bx.set_ylabel("Net Growth (bar)")
+        bx2.set_ylabel("Total Users (line)")
+
+        for left, right in (self.trend_axes, self.growth_axes):
+            left.set_xlabel("Date")
+            left.xaxis_date()
+            left.xaxis.set_major_locator(mdates.WeekdayLocator(interval=1))
+            left.xaxis.set_major_formatter(mdates.DateFormatter("%b %d"))
+            left.tick_params(axis="x", labelrotation=45)
+            left.grid(alpha=0.25)
+
+        self.series = {name: GrowingSeries() for name in list(self.trend_lines) + ['total']}
+
+    def extend(self, metrics):
+        """Add the rows returned by ``SaasMetrics.append``: new bars and line points only"""
+        if len(metrics) == 0:
+            return
+        x = self._date2num(pd.to_datetime(metrics['date']))
+        for name, line in self.trend_lines.items():
+            series = self.series[name]
+            series.extend(x, metrics[name].to_numpy())
+            line.set_data(series.x, series.y)
+
+        total = metrics['total_users'] if 'total_users' in metrics else metrics['cum_net_growth']
+        self.series['total'].extend(x, total.to_numpy())
+        self.total_line.set_data(self.series['total'].x, self.series['total'].y)
+
+        bx = self.growth_axes[0]
+        bx.bar(x, metrics['net_growth'], alpha=0.35, color='C0',
+               label=self.bar_label if self.series['total'].size == len(x) else '_nolegend_')
+
+        for axes in (self.trend_axes, self.growth_axes):
+            for ax in axes:
+                ax.relim()
+                ax.autoscale_view()
+
+    def layout(self):
+        """Combined legends and a tight layout for the current data"""
+        for fig, (left, right) in ((self.trend_fig, self.trend_axes), (self.growth_fig, self.growth_axes)):
+            lines1, labels1 = left.get_legend_handles_labels()
+            lines2, labels2 = right.get_legend_handles_labels()
+            left.legend(lines1 + lines2, labels1 + labels2, loc="upper left", frameon=False)
+            fig.tight_layout()
+
+
+if __name__ == '__main__':
+    import os
+    import sys
+
+    import matplotlib.pyplot as plt
+
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+    from course_data import load_csv
+
+    df = load_csv("saas_users_hard_100.csv").sort_values("date").reset_index(drop=True)
+    metrics = SaasMetrics(windows=(7, 30))
+    charts = LiveSaasCharts(window=7)
+    for start in range(0, len(df), 10):
+        new_rows = metrics.append(df.iloc[start:start + 10])
+        charts.extend(new_rows)
+        charts.layout()
+        plt.pause(0.1)
+    print(new_rows.tail())
+    plt.show()
@@ -0,0 +1,72 @@
+"""Compare the original per-row generate_sample_data loop with the NumPy-batched engine
+
+Usage: python benchmarks/bench_data_engine.py [--rows 365 36500 3650000]
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from common import best_of, report
+from data_engine import generate_customer_data, generate_sales_data
+
+
+def generate_sample_data_loop(n_rows=365, n_customers=1000):
+    """The original per-row implementation, kept as the baseline"""
+    np.random.seed(42)
+
+    dates = pd.date_range(start='2023-01-01', end='2023-12-31', freq='D')
+    sales_data = []
+    for i in range(n_rows):
+        date = dates[i * len(dates) // n_rows]
+        base_sales = 1000 + np.random.normal(0, 200)
+        seasonal_factor = 1 + 0.3 * np.sin(2 * np.pi * date.dayofyear / 365)
+        sales_data.append({
+            'date': date,
+            'sales': max(0, base_sales * seasonal_factor),
+            'region': np.random.choice(['North', 'South', 'East', 'West']),
+            'product': np.random.choice(['Electronics', 'Clothing', 'Books', 'Home']),
+            'customer_type': np.random.choice(['Premium', 'Standard', 'Basic'])
+        })
+    df = pd.DataFrame(sales_data)
+
+    customer_data = []
+    for i in range(n_customers):
+        customer_data.append({
+            'age': np.random.normal(35, 12),
+            'income': np.random.normal(50000, 20000),
+            'satisfaction': np.random.uniform(1, 5),
+            'region': np.random.choice(['North', 'South', 'East', 'West']),
+            'gender': np.random.choice(['Male', 'Female'])
+        })
+
+    return df, pd.DataFrame(customer_data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[365, 36_500, 3_650_000])
+    parser.add_argument('--loop-limit', type=int, default=100_000,
+                        help='skip the loop baseline above this many rows')
+    args = parser.parse_args()
+
+    rows = []
+    for n in args.rows:
+        vec_time, (sales, customers) = best_of(
+            lambda: (generate_sales_data(n), generate_customer_data(1000)))
+        vec_mb = (sales.memory_usage(deep=True).sum() + customers.memory_usage(deep=True).sum()) / 1e6
+
+        if n <= args.loop_limit:
+            loop_time, _ = best_of(lambda: generate_sample_data_loop(n), repeat=1)
+            loop_cell = f'{loop_time:.3f}'
+            speedup = f'{loop_time / vec_time:.0f}x'
+        else:
+            loop_cell, speedup = 'skipped', '-'
+
+        rows.append((f'{n:,}', loop_cell, f'{vec_time:.3f}', speedup, f'{vec_mb:.1f}'))
+
+    report(rows, ('rows', 'loop s', 'vectorized s', 'speedup', 'MB'))
+
+
+if __name__ == '__main__':
+    main()
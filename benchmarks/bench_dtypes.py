@@ -0,0 +1,62 @@
+"""Memory and filter speed of the compact (categorical/float32) frames against object/float64
+
+Usage: python benchmarks/bench_dtypes.py [--rows 100000 1000000 10000000]
+"""
+import argparse
+
+import numpy as np
+
+from common import best_of, report
+from data_engine import category_mask, date_slice, generate_customer_data, generate_sales_data
+
+
+def legacy(df):
+    """The previous representation: object strings and float64 numerics"""
+    casts = {c: object if df[c].dtype == 'category' else np.float64
+             for c in df.columns if df[c].dtype == 'category' or df[c].dtype == np.float32}
+    return df.astype(casts)
+
+
+def bytes_per_row(df):
+    return df.memory_usage(deep=True).sum() / len(df)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000, 10_000_000])
+    args = parser.parse_args()
+
+    memory, filters = [], []
+    for n in args.rows:
+        sales = generate_sales_data(n)
+        customers = generate_customer_data(n)
+        old_sales, old_customers = legacy(sales), legacy(customers)
+
+        for name, new, old in (('sales', sales, old_sales), ('customers', customers, old_customers)):
+            before, after = bytes_per_row(old), bytes_per_row(new)
+            memory.append((name, f'{n:,}', f'{before:.1f}', f'{after:.1f}', f'{before / after:.1f}x'))
+
+        cases = [
+            ('region & product ==',
+             lambda: old_sales[(old_sales['region'] == 'North') & (old_sales['product'] == 'Books')],
+             lambda: sales[category_mask(sales['region'], 'North') & category_mask(sales['product'], 'Books')]),
+            ('date range',
+             lambda: old_sales[(old_sales['date'] >= '2023-06-01') & (old_sales['date'] <= '2023-06-30')],
+             lambda: date_slice(sales, '2023-06-01', '2023-06-30')),
+            ('groupby region sum',
+             lambda: old_sales.groupby('region')['sales'].sum(),
+             lambda: sales.groupby('region', observed=True)['sales'].sum()),
+        ]
+        for label, old_fn, new_fn in cases:
+            old_s, old_result = best_of(old_fn)
+            new_s, new_result = best_of(new_fn)
+            assert len(old_result) == len(new_result), label
+            filters.append((label, f'{n:,}', f'{old_s * 1e3:.2f}', f'{new_s * 1e3:.2f}', f'{old_s / new_s:.1f}x'))
+
+    report(memory, ('frame', 'rows', 'object/float64 bytes/row', 'compact bytes/row', 'saving'))
+    print()
+    report(filters, ('operation', 'rows', 'object/float64 ms', 'compact ms', 'speedup'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""Density and correlation heatmaps from mergeable state against re-binning the rows
+
+* density: ``px.density_heatmap`` over every customer (the rows travel to the
+  browser, which bins them) against a ``DensityGrid`` heatmap, plus the cost
+  of folding in a 1,000-customer batch
+* corr: ``DataFrame.corr()`` over every row against ``CoMoments`` updated
+  with a 1,000-row batch
+* parallel: building the grid over 8 generated partitions in one process
+  against ``reduce_partitions`` across a process pool
+
+Usage: python benchmarks/bench_heatmaps.py [--rows 100000 1000000 10000000] [--workers 4]
+"""
+import argparse
+import functools
+
+import numpy as np
+import plotly.express as px
+from plotly.io.json import to_json_plotly
+
+from common import best_of, report
+from data_engine import generate_customer_data
+from sufficient_stats import CoMoments, DensityGrid, reduce_partitions, uniform_edges
+
+COLUMNS = ['age', 'income', 'satisfaction']
+PARTITIONS = 8
+
+
+def load_partition(task):
+    rows, seed = task
+    return generate_customer_data(rows, seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000, 10_000_000])
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    density, corr, parallel = [], [], []
+    for n in args.rows:
+        customers = generate_customer_data(n)
+        batch = generate_customer_data(1000, 1)
+
+        if n <= 1_000_000:
+            px_s, px_json = best_of(lambda: to_json_plotly(px.density_heatmap(customers, x='age', y='income')), 1)
+            px_cols = (f'{px_s * 1e3:.0f}', f'{len(px_json) / 1024:.0f}')
+        else:
+            px_cols = ('-', '-')  # too large to ship to a browser
+        build_s, grid = best_of(lambda: DensityGrid.from_frame(customers, 'age', 'income'))
+        render_s, grid_json = best_of(lambda: to_json_plotly(grid.heatmap_trace()))
+        append_s, _ = best_of(lambda: grid.update(batch))
+        density.append((f'{n:,}', *px_cols, f'{build_s * 1e3:.1f}', f'{render_s * 1e3:.2f}',
+                        f'{len(grid_json) / 1024:.1f}', f'{append_s * 1e3:.2f}'))
+
+        pandas_s, expected = best_of(lambda: customers[COLUMNS].corr())
+        moments = CoMoments(COLUMNS).update(customers)
+        update_s, _ = best_of(lambda: moments.update(batch).corr())
+        error = np.abs(CoMoments(COLUMNS).update(customers).corr().to_numpy() - expected.to_numpy()).max()
+        corr.append((f'{n:,}', f'{pandas_s * 1e3:.2f}', f'{update_s * 1e3:.3f}', f'{error:.1e}'))
+
+        tasks = [(n // PARTITIONS, seed) for seed in range(PARTITIONS)]
+        edges = (uniform_edges(-20, 90, 40), uniform_edges(-50_000, 150_000, 40))
+        make_grid = functools.partial(DensityGrid, 'age', 'income', *edges)
+        serial_s, serial = best_of(lambda: functools.reduce(
+            lambda merged, task: merged.update(load_partition(task)), tasks, make_grid()), 1)
+        pool_s, pooled = best_of(lambda: reduce_partitions(make_grid, load_partition, tasks, args.workers), 1)
+        assert (serial.counts == pooled.counts).all()
+        parallel.append((f'{n:,}', f'{serial_s:.2f}', f'{pool_s:.2f}', f'{serial_s / pool_s:.1f}x'))
+
+    report(density, ('customers', 'px ms', 'px KiB', 'grid build ms', 'grid render ms', 'grid KiB', 'append 1k ms'))
+    print()
+    report(corr, ('rows', 'DataFrame.corr ms', 'CoMoments +1k ms', 'max abs diff'))
+    print()
+    report(parallel, ('rows', f'{PARTITIONS} partitions serial s', f'pool ({args.workers}) s', 'speedup'))
+
+
+if __name__ == '__main__':
+    main()
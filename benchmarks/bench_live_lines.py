@@ -0,0 +1,105 @@
+"""Frame time of the live line chart: full redraw against set_data + blitting
+
+Each frame shows three series (max, min, average) of ``points`` samples on
+the Agg canvas. 'replot' rebuilds every artist and draws the whole figure,
+like legend.py; 'set_data' reuses the lines but still draws everything;
+'blit' is LiveLineChart restoring its cached background and drawing only
+the lines.
+
+Usage: python benchmarks/bench_live_lines.py [--points 10000 100000 1000000] [--frames 20]
+"""
+import argparse
+import os
+import sys
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+
+from common import ROOT_DIR, report
+
+sys.path.insert(0, os.path.join(ROOT_DIR, '3_legends_grid_axes_labels'))
+from live_lines import LiveLineChart, replot_frame
+
+LABELS = ['max', 'min', 'average']
+STYLE = dict(title='Weather', xlabel='Day', ylabel='Temperature',
+             legend_kw={'fontsize': 'large', 'shadow': True})
+
+
+def frames(points, n_frames, seed=0):
+    """``n_frames`` updates of the three series over a fixed x range (no limit changes)"""
+    rng = np.random.default_rng(seed)
+    x = np.linspace(0, 7, points)
+    for _ in range(n_frames):
+        avg = 45 + 3 * np.sin(x) + rng.normal(0, 0.5, points)
+        yield x, [avg + 4, avg - 4, avg]
+
+
+def per_frame(update, points, n_frames):
+    """Mean seconds per frame of ``update(x, ys)``"""
+    data = list(frames(points, n_frames))
+    update(*data[0])  # warm-up: first draw and background capture
+    start = time.perf_counter()
+    for x, ys in data[1:]:
+        update(x, ys)
+    return (time.perf_counter() - start) / (len(data) - 1)
+
+
+def run_replot(points, n_frames):
+    fig, ax = plt.subplots()
+    try:
+        return per_frame(lambda x, ys: replot_frame(ax, x, ys, LABELS, **STYLE), points, n_frames)
+    finally:
+        plt.close(fig)
+
+
+def run_set_data(points, n_frames):
+    fig, ax = plt.subplots()
+    lines = [ax.plot([], [], label=label)[0] for label in LABELS]
+    ax.set(xlim=(-0.5, 7.5), ylim=(35, 55), title=STYLE['title'], xlabel=STYLE['xlabel'], ylabel=STYLE['ylabel'])
+    ax.grid()
+    ax.legend(loc='upper right', **STYLE['legend_kw'])
+
+    def update(x, ys):
+        for line, y in zip(lines, ys):
+            line.set_data(x, y)
+        fig.canvas.draw()
+    try:
+        return per_frame(update, points, n_frames)
+    finally:
+        plt.close(fig)
+
+
+def run_blit(points, n_frames):
+    fig, ax = plt.subplots()
+    chart = LiveLineChart(ax, LABELS, **STYLE)
+    try:
+        seconds = per_frame(chart.update, points, n_frames)
+        assert chart.full_redraws == 1, chart.full_redraws
+        return seconds
+    finally:
+        chart.close()
+        plt.close(fig)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--points', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--frames', type=int, default=20)
+    args = parser.parse_args()
+
+    rows = []
+    for points in args.points:
+        n_frames = max(3, args.frames if points <= 100_000 else args.frames // 4)
+        replot = run_replot(points, n_frames)
+        set_data = run_set_data(points, n_frames)
+        blit = run_blit(points, n_frames)
+        rows.append((f'{points:,}', f'{replot * 1e3:.1f}', f'{set_data * 1e3:.1f}',
+                     f'{blit * 1e3:.1f}', f'{replot / blit:.1f}x'))
+    report(rows, ('points/series', 'replot ms', 'set_data ms', 'blit ms', 'speedup'))
+
+
+if __name__ == '__main__':
+    main()
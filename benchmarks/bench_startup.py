@@ -0,0 +1,62 @@
+"""Worker startup time of both dashboards with eager and lazy layouts
+
+Each run imports the dashboard in a fresh interpreter, the way a WSGI
+worker does on start or restart, then times its first ``/_dash-layout``
+request, where a layout served per page load builds its eager figures, and
+reports that response's size.
+
+Usage: python benchmarks/bench_startup.py [--repeat 3] [--customers 1000 200000]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+from common import EXAMPLES_DIR, report
+
+PROBE = """
+import time
+start = time.perf_counter()
+import {module} as dashboard
+imported = time.perf_counter() - start
+client = dashboard.app.server.test_client()
+start = time.perf_counter()
+layout = client.get('/_dash-layout').data
+print(imported, time.perf_counter() - start, len(layout))
+"""
+
+
+def measure(module, lazy, customers, repeat):
+    env = dict(os.environ, DASHBOARD_LAZY_LAYOUT='1' if lazy else '0',
+               DASHBOARD_CUSTOMER_ROWS=str(customers))
+    import_s, layout_s, size = float('inf'), float('inf'), 0
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, '-c', PROBE.format(module=module)], cwd=EXAMPLES_DIR,
+                             env=env, capture_output=True, text=True, check=True).stdout
+        imported, first_layout, size = out.split()[-3:]
+        import_s, layout_s = min(import_s, float(imported)), min(layout_s, float(first_layout))
+    return import_s, layout_s, int(size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--customers', type=int, nargs='+', default=[1000, 200_000])
+    args = parser.parse_args()
+
+    rows = []
+    for module in ('advanced_dashboard', 'simple_dashboard'):
+        customers = args.customers if module == 'advanced_dashboard' else [None]
+        for n in customers:
+            eager_import, eager_layout, eager_size = measure(module, False, n or 1000, args.repeat)
+            lazy_import, lazy_layout, lazy_size = measure(module, True, n or 1000, args.repeat)
+            rows.append((module, f'{n:,}' if n else '-',
+                         f'{eager_import:.2f}', f'{eager_layout:.2f}', f'{eager_size / 1e3:.0f}',
+                         f'{lazy_import:.2f}', f'{lazy_layout:.2f}', f'{lazy_size / 1e3:.0f}'))
+
+    report(rows, ('dashboard', 'customers', 'eager import s', 'eager 1st layout s', 'eager layout KB',
+                  'lazy import s', 'lazy 1st layout s', 'lazy layout KB'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""Bytes on the wire and estimated time to first paint of advanced_dashboard
+
+Each configuration starts the dashboard in a fresh interpreter and fetches
+what a browser needs for the first paint: the index page, its scripts, the
+layout, the dependencies and the first sales-trend callback. It then
+revalidates the layout and the callback with their ETags. The first-paint
+estimate is server time plus transfer time at ``--mbps``. The browser's own
+parse and render time is not included.
+
+Configurations: plain (DASHBOARD_COMPRESS=0), gzip (default), and gzip with
+float32 typed-array figures (DASHBOARD_TYPED_ARRAYS=1).
+
+Usage: python benchmarks/bench_wire.py [--customers 1000 50000] [--mbps 10]
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+from common import EXAMPLES_DIR, report
+from run_suite import _clean_env, dashboard_payloads
+
+PROBE = """
+import gzip, json, re, time
+import advanced_dashboard as dashboard
+
+client = dashboard.app.server.test_client()
+headers = {{'Accept-Encoding': 'gzip, br'}}
+wire, server_s = 0, 0.0
+
+def fetch(method, url, **kwargs):
+    global wire, server_s
+    start = time.perf_counter()
+    response = client.open(url, method=method, headers=dict(headers, **kwargs.pop('extra', {{}})), **kwargs)
+    server_s += time.perf_counter() - start
+    wire += len(response.data)
+    return response
+
+index = fetch('GET', '/')
+html = gzip.decompress(index.data) if index.headers.get('Content-Encoding') == 'gzip' else index.data
+for src in re.findall(r'<script src="([^"]+)"', html.decode()):
+    fetch('GET', src)
+layout = fetch('GET', '/_dash-layout')
+layout_bytes = len(layout.data)
+fetch('GET', '/_dash-dependencies')
+callback = fetch('POST', '/_dash-update-component', json=json.loads({payload!r}))
+callback_bytes = len(callback.data)
+first_paint = {{'wire': wire, 'server_s': server_s}}
+
+wire = 0
+for response, method, url, kwargs in ((layout, 'GET', '/_dash-layout', {{}}),
+                                      (callback, 'POST', '/_dash-update-component', {{'json': json.loads({payload!r})}})):
+    etag = response.headers.get('ETag')
+    fetch(method, url, extra={{'If-None-Match': etag}} if etag else {{}}, **kwargs)
+print(json.dumps(dict(first_paint, layout_bytes=layout_bytes, callback_bytes=callback_bytes, revalidate=wire)))
+"""
+
+CONFIGS = {
+    'plain': {'DASHBOARD_COMPRESS': '0'},
+    'gzip': {},
+    'gzip + typed': {'DASHBOARD_TYPED_ARRAYS': '1'},
+}
+
+
+def measure(customers, overrides):
+    payload = json.dumps(dashboard_payloads('advanced_dashboard')[0])
+    env = _clean_env(DASHBOARD_CUSTOMER_ROWS=str(customers), DASHBOARD_FILTER_MODE='server', **overrides)
+    out = subprocess.run([sys.executable, '-c', PROBE.format(payload=payload)], cwd=EXAMPLES_DIR, env=env,
+                         capture_output=True, text=True)
+    if out.returncode != 0:
+        raise RuntimeError(f"probe failed:\n{out.stderr}")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--customers', type=int, nargs='+', default=[1000, 50000])
+    parser.add_argument('--mbps', type=float, default=10.0)
+    args = parser.parse_args()
+
+    rows = []
+    for customers in args.customers:
+        for name, overrides in CONFIGS.items():
+            r = measure(customers, overrides)
+            paint = r['server_s'] + r['wire'] * 8 / (args.mbps * 1e6)
+            rows.append((f'{customers:,}', name, f"{r['layout_bytes'] / 1024:.0f}", f"{r['callback_bytes'] / 1024:.1f}",
+                         f"{r['wire'] / 1024:.0f}", f"{r['revalidate'] / 1024:.1f}", f"{paint:.2f}"))
+    report(rows, ('customers', 'config', 'layout KiB', 'callback KiB', 'first paint KiB',
+                  'revalidate KiB', f'est. paint s @{args.mbps:g}Mbit/s'))
+
+
+if __name__ == '__main__':
+    main()
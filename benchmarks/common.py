@@ -0,0 +1,32 @@
+"""Shared helpers for the benchmark scripts (run them from the repository root)"""
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXAMPLES_DIR = os.path.join(ROOT_DIR, 'seaborn', 'examples')
+
+# Dashboard modules import each other by name, as when run from their folder
+if EXAMPLES_DIR not in sys.path:
+    sys.path.insert(0, EXAMPLES_DIR)
+
+
+def best_of(fn, repeat=3):
+    """Run ``fn`` ``repeat`` times and return (best seconds, last result)"""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def report(rows, header):
+    """Print a small fixed-width table"""
+    widths = [max(len(str(r[i])) for r in rows + [header]) for i in range(len(header))]
+    line = '  '.join(h.ljust(w) for h, w in zip(header, widths))
+    print(line)
+    print('-' * len(line))
+    for row in rows:
+        print('  '.join(str(c).ljust(w) for c, w in zip(row, widths)))
@@ -0,0 +1,279 @@
+"""Reproducible benchmark suite for the dashboards and the notebook charts
+
+Each workload runs at every data scale, as a multiple of the original sizes:
+
+* ``data``: ``generate_sample_data`` (365 sales rows and 1,000 customers at 1x)
+* ``startup``: cold import of each dashboard and its first layout request, in a
+  fresh interpreter like a new WSGI worker, then callback round trips through the
+  Flask test client. The first pass over the inputs is cold and the second is warm.
+* ``render``: Agg rendering of the notebook charts (bar, hist, pie, box, scatter)
+  from the course CSVs, resampled to ``scale`` times their rows
+
+Everything runs headless and offline. Results are written as JSON to
+``benchmarks/results/`` and tagged with the git commit, so runs can be compared
+across commits with ``--compare``. simple_dashboard serves fixed datasets and
+runs at 1x only.
+
+Usage: python benchmarks/run_suite.py [--scales 1 100 10000] [--only data startup render] [--repeat 3]
+       python benchmarks/run_suite.py --compare OLD.json NEW.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from common import EXAMPLES_DIR, ROOT_DIR, best_of, report
+
+sys.path.insert(0, ROOT_DIR)
+
+RESULTS_DIR = os.path.join(ROOT_DIR, 'benchmarks', 'results')
+BASE_SALES_ROWS = 365
+BASE_CUSTOMERS = 1000
+WORKLOADS = ('data', 'startup', 'render')
+CHARTS = ('bar', 'hist', 'pie', 'box', 'scatter')
+
+PROBE = """
+import json, time
+start = time.perf_counter()
+import {module} as dashboard
+imported = time.perf_counter()
+client = dashboard.app.server.test_client()
+layout = client.get('/_dash-layout').data
+ready = time.perf_counter()
+
+payloads = json.loads({payloads!r})
+timings = []
+for payload in payloads * 2:
+    t = time.perf_counter()
+    response = client.post('/_dash-update-component', json=payload)
+    assert response.status_code == 200, response.status_code
+    timings.append(time.perf_counter() - t)
+print(json.dumps({{'import_s': imported - start, 'layout_s': ready - imported,
+                  'layout_bytes': len(layout), 'callbacks': timings}}))
+"""
+
+
+def _callback(output, inputs, state=()):
+    component, prop = output.split('.')
+    return {
+        'output': output,
+        'outputs': {'id': component, 'property': prop},
+        'inputs': [{'id': i, 'property': p, 'value': v} for i, p, v in inputs],
+        'changedPropIds': [f'{inputs[0][0]}.{inputs[0][1]}'],
+        'state': [{'id': i, 'property': p, 'value': v} for i, p, v in state],
+    }
+
+
+def dashboard_payloads(module):
+    """One callback request per dropdown combination of the dashboard's main callback"""
+    if module == 'advanced_dashboard':
+        from data_engine import PRODUCTS, REGIONS
+        return [_callback('sales-trend-chart.figure',
+                          [('region-dropdown', 'value', region), ('product-dropdown', 'value', product),
+                           ('sales-trend-chart', 'relayoutData', None)],
+                          [('sales-trend-width', 'data', 800)])
+                for region in REGIONS for product in PRODUCTS]
+    return [_callback('dynamic-chart.figure',
+                      [('day-dropdown', 'value', day), ('gender-dropdown', 'value', sex)])
+            for day in ('Thur', 'Fri', 'Sat', 'Sun') for sex in ('Male', 'Female')]
+
+
+def _clean_env(**overrides):
+    # Feature switches from the caller's shell would make runs incomparable
+    env = {k: v for k, v in os.environ.items() if not k.startswith('DASHBOARD_')}
+    env.update(MPLBACKEND='Agg', **overrides)
+    return env
+
+
+def bench_data(scale, repeat):
+    from data_engine import generate_sample_data
+
+    seconds, (sales, customers) = best_of(
+        lambda: generate_sample_data(BASE_SALES_ROWS * scale, BASE_CUSTOMERS * scale), repeat)
+    return [{'benchmark': 'data', 'name': 'generate_sample_data', 'scale': scale,
+             'metrics': {'seconds': seconds, 'sales_rows': len(sales), 'customers': len(customers)}}]
+
+
+def bench_startup(scale, repeat, cache_dir):
+    results = []
+    for module in ('advanced_dashboard', 'simple_dashboard'):
+        if module == 'simple_dashboard' and scale != 1:
+            continue
+        env = _clean_env(DASHBOARD_SALES_ROWS=str(BASE_SALES_ROWS * scale),
+                         DASHBOARD_CUSTOMER_ROWS=str(BASE_CUSTOMERS * scale),
+                         DATASET_CACHE_DIR=cache_dir,
+                         DASHBOARD_FILTER_MODE='server')  # time the server callbacks even for small data
+        payloads = dashboard_payloads(module)
+        probe = PROBE.format(module=module, payloads=json.dumps(payloads))
+        runs = []
+        for _ in range(repeat):
+            out = subprocess.run([sys.executable, '-c', probe], cwd=EXAMPLES_DIR, env=env,
+                                 capture_output=True, text=True)
+            if out.returncode != 0:
+                raise RuntimeError(f"{module} probe failed:\n{out.stderr}")
+            runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+        n = len(payloads)
+        results.append({'benchmark': 'startup', 'name': module, 'scale': scale, 'metrics': {
+            'import_s': min(r['import_s'] for r in runs),
+            'layout_s': min(r['layout_s'] for r in runs),
+            'layout_bytes': runs[-1]['layout_bytes'],
+            'callback_cold_s': min(statistics.median(r['callbacks'][:n]) for r in runs),
+            'callback_warm_s': min(statistics.median(r['callbacks'][n:]) for r in runs),
+        }})
+    return results
+
+
+def _resample(df, columns, scale, seed=0):
+    rng = np.random.default_rng(seed)
+    return df[columns].iloc[rng.integers(0, len(df), len(df) * scale)].reset_index(drop=True)
+
+
+def chart_inputs(scale):
+    """Each chart's notebook data, resampled to ``scale`` times its rows"""
+    from course_data import load_csv
+
+    applicants = load_csv('bootcamp_applicants_500.csv')
+    climate = load_csv('climate_energy_morocco_5years.csv')
+    return {
+        'bar': _resample(applicants, ['field_of_study'], scale),
+        'hist': _resample(applicants, ['age'], scale),
+        'pie': _resample(applicants, ['education_level'], scale),
+        'box': _resample(climate, ['season', 'energy_kwh'], scale),
+        'scatter': _resample(climate, ['temperature_c', 'energy_kwh'], scale),
+    }
+
+
+def draw_chart(kind, df):
+    """Aggregate like the notebook does, draw on an Agg canvas and rasterize"""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(8, 5))
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    if kind == 'bar':
+        counts = df['field_of_study'].value_counts()
+        ax.bar(counts.index.astype(str), counts.to_numpy(), color='#1f77b4')
+    elif kind == 'hist':
+        ax.hist(df['age'].to_numpy(), bins=20, edgecolor='white')
+    elif kind == 'pie':
+        counts = df['education_level'].value_counts(sort=False)
+        ax.pie(counts.to_numpy(), labels=counts.index.astype(str), autopct='%0.1f%%')
+    elif kind == 'box':
+        groups = df.groupby('season', observed=True)['energy_kwh']
+        ax.boxplot([g.to_numpy() for _, g in groups])
+        ax.set_xticks(range(1, groups.ngroups + 1), [str(k) for k, _ in groups])
+    elif kind == 'scatter':
+        ax.scatter(df['temperature_c'].to_numpy(), df['energy_kwh'].to_numpy(), s=4, alpha=0.3)
+    canvas.draw()
+
+
+def bench_render(scale, repeat):
+    inputs = chart_inputs(scale)
+    draw_chart('bar', inputs['bar'].head(10))  # imports and font cache stay out of the timings
+    results = []
+    for kind in CHARTS:
+        seconds, _ = best_of(lambda: draw_chart(kind, inputs[kind]), repeat)
+        results.append({'benchmark': 'render', 'name': kind, 'scale': scale,
+                        'metrics': {'seconds': seconds, 'rows': len(inputs[kind])}})
+    return results
+
+
+def environment():
+    def git(*args):
+        try:
+            return subprocess.run(['git', *args], cwd=ROOT_DIR, capture_output=True,
+                                  text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    import dash
+    import matplotlib
+    import pandas as pd
+    import plotly
+
+    return {
+        'commit': git('rev-parse', 'HEAD'),
+        'dirty': bool(git('status', '--porcelain', '--untracked-files=no')),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'versions': {'numpy': np.__version__, 'pandas': pd.__version__, 'matplotlib': matplotlib.__version__,
+                     'dash': dash.__version__, 'plotly': plotly.__version__},
+    }
+
+
+def _key_metrics(metrics):
+    return {k: v for k, v in metrics.items() if k.endswith('_s') or k == 'seconds'}
+
+
+def compare(old_path, new_path):
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    before = {(r['benchmark'], r['name'], r['scale']): r['metrics'] for r in old['results']}
+
+    rows = []
+    for r in new['results']:
+        previous = before.get((r['benchmark'], r['name'], r['scale']))
+        if previous is None:
+            continue
+        for metric, value in _key_metrics(r['metrics']).items():
+            if metric in previous:
+                rows.append((r['benchmark'], r['name'], f"{r['scale']}x", metric, f'{previous[metric]:.4f}',
+                             f'{value:.4f}', f'{previous[metric] / value:.2f}x' if value else '-'))
+    print(f"{(old['environment']['commit'] or '?')[:10]} -> {(new['environment']['commit'] or '?')[:10]}")
+    report(rows, ('benchmark', 'name', 'scale', 'metric', 'old', 'new', 'speedup'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 100, 10_000])
+    parser.add_argument('--only', nargs='+', choices=WORKLOADS, default=list(WORKLOADS))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help='result file (default: benchmarks/results/<timestamp>-<commit>.json)')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help='compare two result files and exit')
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    env = environment()
+    results = []
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for scale in args.scales:
+            if 'data' in args.only:
+                results += bench_data(scale, args.repeat)
+            if 'startup' in args.only:
+                results += bench_startup(scale, args.repeat, cache_dir)
+            if 'render' in args.only:
+                results += bench_render(scale, args.repeat)
+            print(f"finished {scale}x", file=sys.stderr)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{env['timestamp'].replace(':', '')}-{(env['commit'] or 'nogit')[:10]}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({'environment': env, 'scales': args.scales, 'repeat': args.repeat, 'results': results},
+                  f, indent=1)
+
+    rows = [(r['benchmark'], r['name'], f"{r['scale']}x",
+             '  '.join(f'{k}={v:.4f}' for k, v in _key_metrics(r['metrics']).items()))
+            for r in results]
+    report(rows, ('benchmark', 'name', 'scale', 'seconds'))
+    print(f"\nwrote {output}")
+
+
+if __name__ == '__main__':
+    main()
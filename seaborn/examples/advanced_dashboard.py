@@ -1,54 +1,89 @@
 import dash
-from dash import dcc, html, Input, Output, callback
+from dash import dcc, html, Input, Output, State, Patch, ClientsideFunction, callback, ctx, no_update
+from dash.exceptions import PreventUpdate
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
-import random
+import os
+
+from binned_rendering import customer_scatter, customer_scatter_3d, render_mode
+from callback_metrics import instrument_from_env, phase
+from callback_pool import raise_if_superseded, run_on_pool_from_env
+from client_filter import choose_filter_mode, encode_frame, figure_template
+from data_engine import generate_sample_data
+from downsampling import downsample, point_budget, relayout_x_range, visible_window
+from figure_cache import FigureCache
+from lazy_layout import LazyGraphs
+from live_ingest import LiveIngestor, source_from_env
+from sales_cube import SalesCube
+from shared_store import SharedFrames, store_root_from_env
+from wire_format import compress_responses_from_env, maybe_typed, plain_figure
 
 # Initialize Dash app
 app = dash.Dash(__name__)
 
-# Sample data generation
-def generate_sample_data():
-    """Generate comprehensive sample data for the dashboard"""
-    np.random.seed(42)
-    
-    # Sales data
-    dates = pd.date_range(start='2023-01-01', end='2023-12-31', freq='D')
-    sales_data = []
-    
-    for date in dates:
-        base_sales = 1000 + np.random.normal(0, 200)
-        seasonal_factor = 1 + 0.3 * np.sin(2 * np.pi * date.dayofyear / 365)
-        sales_data.append({
-            'date': date,
-            'sales': max(0, base_sales * seasonal_factor),
-            'region': np.random.choice(['North', 'South', 'East', 'West']),
-            'product': np.random.choice(['Electronics', 'Clothing', 'Books', 'Home']),
-            'customer_type': np.random.choice(['Premium', 'Standard', 'Basic'])
-        })
-    
-    df = pd.DataFrame(sales_data)
-    
-    # Customer demographics
-    customer_data = []
-    for i in range(1000):
-        customer_data.append({
-            'age': np.random.normal(35, 12),
-            'income': np.random.normal(50000, 20000),
-            'satisfaction': np.random.uniform(1, 5),
-            'region': np.random.choice(['North', 'South', 'East', 'West']),
-            'gender': np.random.choice(['Male', 'Female'])
-        })
-    
-    customer_df = pd.DataFrame(customer_data)
-    
-    return df, customer_df
+# Generate data (row counts can be raised for load testing)
+SALES_ROWS = int(os.environ.get('DASHBOARD_SALES_ROWS', 0)) or None
+CUSTOMER_ROWS = int(os.environ.get('DASHBOARD_CUSTOMER_ROWS', 1000))
+
+# With DASHBOARD_SHARED_STORE, workers map the frames published by shared_store.py instead
+SHARED_STORE = store_root_from_env()
+if SHARED_STORE:
+    shared = SharedFrames(SHARED_STORE, wait=60)
+    sales_df, customer_df = shared['sales'], shared['customers']
+else:
+    shared = None
+    sales_df, customer_df = generate_sample_data(SALES_ROWS, CUSTOMER_ROWS)
+
+# Aggregate once so charts and callbacks never scan sales_df
+sales_cube = SalesCube(sales_df)
+
+# Micro-batches from DASHBOARD_LIVE_SOURCE ('synthetic' or a CSV file to tail)
+live = LiveIngestor(sales_df, customer_df, sales_cube, source_from_env(sales_df))
+LIVE_INTERVAL_MS = int(os.environ.get('DASHBOARD_LIVE_INTERVAL_MS', 5000))
+# One ingestion thread per process; the live callbacks below only read
+live.start(LIVE_INTERVAL_MS / 1000)
+
+def kpi_texts():
+    """Formatted KPI card values from the running totals"""
+    kpis = live.kpis()
+    return (
+        f"${kpis['total_sales']:,.0f}",
+        f"{kpis['customers']:,}",
+        f"{kpis['avg_satisfaction']:.1f}/5",
+        f"{kpis['sales_rows']}"
+    )
+
+# Serialized callback figures, invalidated whenever the cube changes
+figure_cache = FigureCache(maxsize=64, ttl=600)
+
+def load_published(version, frames):
+    """Swap in a snapshot newly published to the shared store
 
-# Generate data
-sales_df, customer_df = generate_sample_data()
+    Figures are keyed by ``live.sales_version`` and ``live.customers_version``,
+    which keep increasing across snapshots, and the layout is rebuilt on every
+    page load, so nothing from the old snapshot is served.
+    """
+    global sales_df, customer_df, sales_cube
+    sales_df, customer_df = frames['sales'], frames['customers']
+    sales_cube = SalesCube(sales_df)
+    live.reset(sales_df, customer_df, sales_cube)
+    figure_cache.invalidate()
+    lazy_graphs.cache.invalidate()
+
+if shared is not None:
+    shared.watch(load_published)
+
+# Opt-in server-side downsampling of the sales trend line ('lttb' or 'minmax')
+DOWNSAMPLE_METHOD = os.environ.get('DASHBOARD_DOWNSAMPLE') or None
+
+def sales_trend_points(trend, x_range=None, n_points=None):
+    """Reduce a daily trend to the graph's point budget within the visible range"""
+    if not DOWNSAMPLE_METHOD:
+        return trend
+    x, y = visible_window(trend['date'].to_numpy(), trend['sales'].to_numpy(), x_range)
+    x, y = downsample(x, y, n_points or point_budget(), DOWNSAMPLE_METHOD)
+    return pd.DataFrame({'date': x, 'sales': y})
 
 # Custom CSS with Tailwind-like styling
 external_stylesheets = [
@@ -58,235 +93,493 @@ external_stylesheets = [
 
 app = dash.Dash(__name__, external_stylesheets=external_stylesheets)
 
-# Define the layout
-app.layout = html.Div([
-    # Header
-    html.Div([
+# Graphs are built while defining the layout, or on first view with DASHBOARD_LAZY_LAYOUT=1
+lazy_graphs = LazyGraphs(app)
+
+# Create visualizations
+def create_sales_trend_chart():
+    """Create daily sales trend across all regions"""
+    return px.line(
+        sales_trend_points(sales_cube.daily_totals()),
+        x='date', y='sales',
+        title="Daily Sales Trend",
+        color_discrete_sequence=['#3B82F6']
+    ).update_layout(
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        font=dict(size=12),
+        title_font_size=16
+    )
+
+def create_regional_sales_chart():
+    """Create sales by region pie chart"""
+    return px.pie(
+        sales_cube.region_totals(),
+        values='sales', names='region',
+        title="Sales Distribution by Region",
+        color_discrete_sequence=['#10B981', '#F59E0B', '#EF4444', '#8B5CF6']
+    ).update_layout(
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        font=dict(size=12),
+        title_font_size=16
+    )
+
+def customer_figure(fig):
+    """Customer figures as sent: plain lists when live ticks extend them in place, else ``maybe_typed``"""
+    return plain_figure(fig) if live.source is not None else maybe_typed(fig)
+
+def create_customer_scatter():
+    """Create customer age vs income scatter"""
+    return customer_figure(customer_scatter(live.customer_frame()).update_layout(
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        font=dict(size=12),
+        title_font_size=16
+    ))
+
+def create_product_bar():
+    """Create sales by product bar chart"""
+    return px.bar(
+        sales_cube.product_totals(),
+        x='product', y='sales',
+        title="Sales by Product Category",
+        color='sales',
+        color_continuous_scale='Blues'
+    ).update_layout(
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        font=dict(size=12),
+        title_font_size=16,
+        xaxis_tickangle=-45
+    )
+
+def create_satisfaction_heatmap():
+    """Create customer density heatmap from the running age x income grid"""
+    # Read under the ingestor lock: a batch may grow the grid's edges
+    _, (trace, outside) = live.snapshot(lambda: (
+        live.customer_density.heatmap_trace(colorscale='Reds', colorbar=dict(title='count')),
+        live.customer_density.outside))
+    title = "Customer Density by Age and Income"
+    if outside:
+        title += f" ({outside:,} customers outside the range shown)"
+    return maybe_typed(go.Figure(trace).update_layout(
+        title=title,
+        xaxis_title='age',
+        yaxis_title='income',
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        font=dict(size=12),
+        title_font_size=16
+    ))
+
+def create_3d_scatter():
+    """Create 3D customer scatter"""
+    return customer_figure(customer_scatter_3d(live.customer_frame()).update_layout(
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        font=dict(size=12),
+        title_font_size=16
+    ))
+
+@figure_cache.memoize(version=lambda: live.sales_version)
+def build_sales_trend(selected_region, selected_product, x_range=None, n_points=None):
+    with phase('aggregate'):
+        points = sales_trend_points(sales_cube.trend(selected_region, selected_product), x_range, n_points)
+    raise_if_superseded()
+    with phase('figure'):
+        fig = px.line(
+            points,
+            x='date', y='sales',
+            title=f"Sales Trend - {selected_region} {selected_product}",
+            color_discrete_sequence=['#3B82F6']
+        ).update_layout(
+            plot_bgcolor='white',
+            paper_bgcolor='white',
+            font=dict(size=12),
+            title_font_size=16,
+            uirevision=f"{selected_region}-{selected_product}"
+        )
+        if x_range is not None:
+            fig.update_xaxes(range=list(x_range))
+        figure = fig.to_dict()
+        # A plain list rather than a typed array, so live ticks can Patch-extend it in the browser
+        figure['data'][0]['y'] = points['sales'].astype(float).tolist()
+
+    return figure
+
+def sales_trend_payload():
+    """Every cube cell plus an empty trend figure, for filtering the trend in the browser"""
+    payload = encode_frame(sales_cube.cells())
+    payload['figure'] = figure_template(build_sales_trend(sales_df['region'].iloc[0], sales_df['product'].iloc[0]))
+    # Cells of later live batches, appended by ``refresh_live_data`` and summed in by the browser
+    payload['more'] = []
+    return payload
+
+def new_trend_cells(batches):
+    """Sales of ``batches`` summed per region/product/date cell, encoded like the payload; None if there are none"""
+    frames = [b.sales for b in batches if b.sales is not None]
+    if not frames:
+        return None
+    cells = pd.concat(frames).groupby(['region', 'product', 'date'], observed=True)['sales'].sum().reset_index()
+    return encode_frame(cells)
+
+# Small trend data is shipped once and filtered clientside (DASHBOARD_FILTER_MODE=auto|client|server);
+# zoom-dependent downsampling needs the server
+trend_payload = None if DOWNSAMPLE_METHOD else sales_trend_payload()
+TREND_FILTER_MODE = choose_filter_mode(trend_payload)
+
+# Define the layout, rebuilt on every page load so it shows the current snapshot
+def serve_layout():
+    # Built while ingestion waits, so the cursor names exactly the rows the figures show
+    return live.snapshot(build_layout)[1]
+
+def build_layout():
+    # Versions the figures are built at, so the first tick only sends what changed since
+    layout_cursor = {'version': live.version, 'sales': live.sales_version, 'customers': live.customers_version}
+
+    return html.Div([
+        # Header
         html.Div([
-            html.H1("📊 Advanced Analytics Dashboard", 
-                   className="text-4xl font-bold text-white mb-2"),
-            html.P("Real-time business intelligence and data visualization", 
-                  className="text-xl text-blue-100")
-        ], className="text-center")
-    ], className="bg-gradient-to-r from-blue-600 to-purple-600 p-8 rounded-lg mb-8 shadow-lg"),
+            html.Div([
+                html.H1("📊 Advanced Analytics Dashboard", 
+                       className="text-4xl font-bold text-white mb-2"),
+                html.P("Real-time business intelligence and data visualization", 
+                      className="text-xl text-blue-100")
+            ], className="text-center")
+        ], className="bg-gradient-to-r from-blue-600 to-purple-600 p-8 rounded-lg mb-8 shadow-lg"),
     
-    # KPI Cards
-    html.Div([
+        # KPI Cards
         html.Div([
             html.Div([
-                html.I(className="fas fa-chart-line text-3xl text-green-500 mb-2"),
-                html.H3("Total Sales", className="text-2xl font-bold text-gray-800"),
-                html.P(f"${sales_df['sales'].sum():,.0f}", className="text-3xl font-bold text-green-600")
-            ], className="text-center p-6 bg-white rounded-lg shadow-md hover:shadow-lg transition-shadow")
-        ], className="w-full md:w-1/4 p-2"),
+                html.Div([
+                    html.I(className="fas fa-chart-line text-3xl text-green-500 mb-2"),
+                    html.H3("Total Sales", className="text-2xl font-bold text-gray-800"),
+                    html.P(kpi_texts()[0], id='kpi-total-sales', className="text-3xl font-bold text-green-600")
+                ], className="text-center p-6 bg-white rounded-lg shadow-md hover:shadow-lg transition-shadow")
+            ], className="w-full md:w-1/4 p-2"),
         
-        html.Div([
             html.Div([
-                html.I(className="fas fa-users text-3xl text-blue-500 mb-2"),
-                html.H3("Total Customers", className="text-2xl font-bold text-gray-800"),
-                html.P(f"{len(customer_df):,}", className="text-3xl font-bold text-blue-600")
-            ], className="text-center p-6 bg-white rounded-lg shadow-md hover:shadow-lg transition-shadow")
-        ], className="w-full md:w-1/4 p-2"),
+                html.Div([
+                    html.I(className="fas fa-users text-3xl text-blue-500 mb-2"),
+                    html.H3("Total Customers", className="text-2xl font-bold text-gray-800"),
+                    html.P(kpi_texts()[1], id='kpi-customers', className="text-3xl font-bold text-blue-600")
+                ], className="text-center p-6 bg-white rounded-lg shadow-md hover:shadow-lg transition-shadow")
+            ], className="w-full md:w-1/4 p-2"),
         
-        html.Div([
             html.Div([
-                html.I(className="fas fa-star text-3xl text-yellow-500 mb-2"),
-                html.H3("Avg Satisfaction", className="text-2xl font-bold text-gray-800"),
-                html.P(f"{customer_df['satisfaction'].mean():.1f}/5", className="text-3xl font-bold text-yellow-600")
-            ], className="text-center p-6 bg-white rounded-lg shadow-md hover:shadow-lg transition-shadow")
-        ], className="w-full md:w-1/4 p-2"),
+                html.Div([
+                    html.I(className="fas fa-star text-3xl text-yellow-500 mb-2"),
+                    html.H3("Avg Satisfaction", className="text-2xl font-bold text-gray-800"),
+                    html.P(kpi_texts()[2], id='kpi-satisfaction', className="text-3xl font-bold text-yellow-600")
+                ], className="text-center p-6 bg-white rounded-lg shadow-md hover:shadow-lg transition-shadow")
+            ], className="w-full md:w-1/4 p-2"),
         
-        html.Div([
             html.Div([
-                html.I(className="fas fa-calendar text-3xl text-purple-500 mb-2"),
-                html.H3("Days Tracked", className="text-2xl font-bold text-gray-800"),
-                html.P(f"{len(sales_df)}", className="text-3xl font-bold text-purple-600")
-            ], className="text-center p-6 bg-white rounded-lg shadow-md hover:shadow-lg transition-shadow")
-        ], className="w-full md:w-1/4 p-2")
-    ], className="flex flex-wrap mb-8"),
+                html.Div([
+                    html.I(className="fas fa-calendar text-3xl text-purple-500 mb-2"),
+                    html.H3("Days Tracked", className="text-2xl font-bold text-gray-800"),
+                    html.P(kpi_texts()[3], id='kpi-days', className="text-3xl font-bold text-purple-600")
+                ], className="text-center p-6 bg-white rounded-lg shadow-md hover:shadow-lg transition-shadow")
+            ], className="w-full md:w-1/4 p-2")
+        ], className="flex flex-wrap mb-8"),
     
-    # Charts Row 1
-    html.Div([
-        # Sales Trend Chart
+        # Charts Row 1
         html.Div([
-            html.H3("📈 Sales Trend Over Time", className="text-2xl font-bold text-gray-800 mb-4"),
-            dcc.Graph(
-                id='sales-trend-chart',
-                figure=px.line(
-                    sales_df.groupby('date')['sales'].sum().reset_index(),
-                    x='date', y='sales',
-                    title="Daily Sales Trend",
-                    color_discrete_sequence=['#3B82F6']
-                ).update_layout(
-                    plot_bgcolor='white',
-                    paper_bgcolor='white',
-                    font=dict(size=12),
-                    title_font_size=16
-                )
-            )
-        ], className="w-full lg:w-1/2 p-4 bg-white rounded-lg shadow-md"),
+            # Sales Trend Chart
+            html.Div([
+                html.H3("📈 Sales Trend Over Time", className="text-2xl font-bold text-gray-800 mb-4"),
+                lazy_graphs.graph('sales-trend-chart', create_sales_trend_chart,
+                                  version=lambda: live.sales_version, filled_by_callback=True),
+                dcc.Store(id='sales-trend-width'),
+                dcc.Store(id='sales-trend-cursor'),
+                dcc.Store(id='sales-trend-data', data=sales_trend_payload() if TREND_FILTER_MODE == 'client' else None)
+            ], className="w-full lg:w-1/2 p-4 bg-white rounded-lg shadow-md"),
         
-        # Regional Sales
-        html.Div([
-            html.H3("🗺️ Sales by Region", className="text-2xl font-bold text-gray-800 mb-4"),
-            dcc.Graph(
-                id='regional-sales-chart',
-                figure=px.pie(
-                    sales_df.groupby('region')['sales'].sum().reset_index(),
-                    values='sales', names='region',
-                    title="Sales Distribution by Region",
-                    color_discrete_sequence=['#10B981', '#F59E0B', '#EF4444', '#8B5CF6']
-                ).update_layout(
-                    plot_bgcolor='white',
-                    paper_bgcolor='white',
-                    font=dict(size=12),
-                    title_font_size=16
-                )
-            )
-        ], className="w-full lg:w-1/2 p-4 bg-white rounded-lg shadow-md")
-    ], className="flex flex-wrap mb-8"),
+            # Regional Sales
+            html.Div([
+                html.H3("🗺️ Sales by Region", className="text-2xl font-bold text-gray-800 mb-4"),
+                lazy_graphs.graph('regional-sales-chart', create_regional_sales_chart,
+                                  version=lambda: live.sales_version)
+            ], className="w-full lg:w-1/2 p-4 bg-white rounded-lg shadow-md")
+        ], className="flex flex-wrap mb-8"),
     
-    # Charts Row 2
-    html.Div([
-        # Customer Demographics
+        # Charts Row 2
         html.Div([
-            html.H3("👥 Customer Demographics", className="text-2xl font-bold text-gray-800 mb-4"),
-            dcc.Graph(
-                id='customer-scatter',
-                figure=px.scatter(
-                    customer_df, x='age', y='income', color='satisfaction',
-                    size='satisfaction', hover_data=['region', 'gender'],
-                    title="Customer Age vs Income (colored by satisfaction)",
-                    color_continuous_scale='Viridis'
-                ).update_layout(
-                    plot_bgcolor='white',
-                    paper_bgcolor='white',
-                    font=dict(size=12),
-                    title_font_size=16
-                )
-            )
-        ], className="w-full lg:w-1/2 p-4 bg-white rounded-lg shadow-md"),
+            # Customer Demographics
+            html.Div([
+                html.H3("👥 Customer Demographics", className="text-2xl font-bold text-gray-800 mb-4"),
+                lazy_graphs.graph('customer-scatter', create_customer_scatter,
+                                  version=lambda: live.customers_version)
+            ], className="w-full lg:w-1/2 p-4 bg-white rounded-lg shadow-md"),
         
-        # Product Performance
-        html.Div([
-            html.H3("📦 Product Performance", className="text-2xl font-bold text-gray-800 mb-4"),
-            dcc.Graph(
-                id='product-bar',
-                figure=px.bar(
-                    sales_df.groupby('product')['sales'].sum().reset_index(),
-                    x='product', y='sales',
-                    title="Sales by Product Category",
-                    color='sales',
-                    color_continuous_scale='Blues'
-                ).update_layout(
-                    plot_bgcolor='white',
-                    paper_bgcolor='white',
-                    font=dict(size=12),
-                    title_font_size=16,
-                    xaxis_tickangle=-45
-                )
-            )
-        ], className="w-full lg:w-1/2 p-4 bg-white rounded-lg shadow-md")
-    ], className="flex flex-wrap mb-8"),
+            # Product Performance
+            html.Div([
+                html.H3("📦 Product Performance", className="text-2xl font-bold text-gray-800 mb-4"),
+                lazy_graphs.graph('product-bar', create_product_bar,
+                                  version=lambda: live.sales_version)
+            ], className="w-full lg:w-1/2 p-4 bg-white rounded-lg shadow-md")
+        ], className="flex flex-wrap mb-8"),
     
-    # Charts Row 3
-    html.Div([
-        # Heatmap
+        # Charts Row 3
         html.Div([
-            html.H3("🔥 Customer Satisfaction Heatmap", className="text-2xl font-bold text-gray-800 mb-4"),
-            dcc.Graph(
-                id='satisfaction-heatmap',
-                figure=px.density_heatmap(
-                    customer_df, x='age', y='income',
-                    title="Customer Density by Age and Income",
-                    color_continuous_scale='Reds'
-                ).update_layout(
-                    plot_bgcolor='white',
-                    paper_bgcolor='white',
-                    font=dict(size=12),
-                    title_font_size=16
-                )
-            )
-        ], className="w-full lg:w-1/2 p-4 bg-white rounded-lg shadow-md"),
+            # Heatmap
+            html.Div([
+                html.H3("🔥 Customer Satisfaction Heatmap", className="text-2xl font-bold text-gray-800 mb-4"),
+                lazy_graphs.graph('satisfaction-heatmap', create_satisfaction_heatmap,
+                                  version=lambda: live.customers_version)
+            ], className="w-full lg:w-1/2 p-4 bg-white rounded-lg shadow-md"),
         
-        # 3D Scatter
-        html.Div([
-            html.H3("🌐 3D Customer Analysis", className="text-2xl font-bold text-gray-800 mb-4"),
-            dcc.Graph(
-                id='3d-scatter',
-                figure=px.scatter_3d(
-                    customer_df, x='age', y='income', z='satisfaction',
-                    color='region', size='satisfaction',
-                    title="3D Customer Analysis",
-                    color_discrete_sequence=['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4']
-                ).update_layout(
-                    plot_bgcolor='white',
-                    paper_bgcolor='white',
-                    font=dict(size=12),
-                    title_font_size=16
-                )
-            )
-        ], className="w-full lg:w-1/2 p-4 bg-white rounded-lg shadow-md")
-    ], className="flex flex-wrap mb-8"),
+            # 3D Scatter
+            html.Div([
+                html.H3("🌐 3D Customer Analysis", className="text-2xl font-bold text-gray-800 mb-4"),
+                lazy_graphs.graph('3d-scatter', create_3d_scatter,
+                                  version=lambda: live.customers_version)
+            ], className="w-full lg:w-1/2 p-4 bg-white rounded-lg shadow-md")
+        ], className="flex flex-wrap mb-8"),
     
-    # Interactive Controls
-    html.Div([
+        # Interactive Controls
         html.Div([
-            html.H3("🎛️ Interactive Controls", className="text-2xl font-bold text-gray-800 mb-4"),
             html.Div([
-                html.Label("Select Region:", className="block text-sm font-medium text-gray-700 mb-2"),
-                dcc.Dropdown(
-                    id='region-dropdown',
-                    options=[{'label': region, 'value': region} for region in sales_df['region'].unique()],
-                    value=sales_df['region'].unique()[0],
-                    className="mb-4"
-                ),
-                html.Label("Select Product:", className="block text-sm font-medium text-gray-700 mb-2"),
-                dcc.Dropdown(
-                    id='product-dropdown',
-                    options=[{'label': product, 'value': product} for product in sales_df['product'].unique()],
-                    value=sales_df['product'].unique()[0],
-                    className="mb-4"
-                ),
-                html.Button("🔄 Refresh Data", id="refresh-button", 
-                           className="bg-blue-500 hover:bg-blue-700 text-white font-bold py-2 px-4 rounded transition-colors")
-            ], className="p-6 bg-gray-50 rounded-lg")
-        ], className="w-full p-4 bg-white rounded-lg shadow-md")
-    ], className="mb-8"),
+                html.H3("🎛️ Interactive Controls", className="text-2xl font-bold text-gray-800 mb-4"),
+                html.Div([
+                    html.Label("Select Region:", className="block text-sm font-medium text-gray-700 mb-2"),
+                    dcc.Dropdown(
+                        id='region-dropdown',
+                        options=[{'label': region, 'value': region} for region in sales_df['region'].unique()],
+                        value=sales_df['region'].unique()[0],
+                        className="mb-4"
+                    ),
+                    html.Label("Select Product:", className="block text-sm font-medium text-gray-700 mb-2"),
+                    dcc.Dropdown(
+                        id='product-dropdown',
+                        options=[{'label': product, 'value': product} for product in sales_df['product'].unique()],
+                        value=sales_df['product'].unique()[0],
+                        className="mb-4"
+                    ),
+                    html.Button("🔄 Refresh Data", id="refresh-button", 
+                               className="bg-blue-500 hover:bg-blue-700 text-white font-bold py-2 px-4 rounded transition-colors"),
+                    dcc.Interval(id='live-interval', interval=LIVE_INTERVAL_MS, disabled=live.source is None and shared is None),
+                    dcc.Store(id='live-cursor', data=layout_cursor)
+                ], className="p-6 bg-gray-50 rounded-lg")
+            ], className="w-full p-4 bg-white rounded-lg shadow-md")
+        ], className="mb-8"),
     
-    # Footer
-    html.Div([
-        html.P("📊 Built with Dash, Plotly, and Tailwind CSS", 
-               className="text-center text-gray-600 py-4")
-    ], className="bg-gray-100 rounded-lg")
+        # Footer
+        html.Div([
+            html.P("📊 Built with Dash, Plotly, and Tailwind CSS", 
+                   className="text-center text-gray-600 py-4")
+        ], className="bg-gray-100 rounded-lg")
     
-], className="min-h-screen bg-gray-100 p-4")
+    ], className="min-h-screen bg-gray-100 p-4")
+
+app.layout = serve_layout
 
 # Callbacks for interactivity
+def drawn_trend(selected_region, selected_product, x_range=None, n_points=None):
+    """Trend figure tagged with the live version and selection it shows
+
+    ``refresh_live_data`` extends the trend from that version, which reaches
+    it through the ``sales-trend-cursor`` store whichever callback drew it.
+    """
+    version, fig = live.snapshot(build_sales_trend, selected_region, selected_product, x_range, n_points)
+    meta = {'live_version': version, 'region': selected_region, 'product': selected_product}
+    return dict(fig, layout=dict(fig['layout'], meta=meta))
+
+def update_sales_trend(selected_region, selected_product, relayout_data=None, graph_width=None):
+    if not DOWNSAMPLE_METHOD:
+        if relayout_data is not None and ctx.triggered_id == 'sales-trend-chart':
+            raise PreventUpdate
+        return drawn_trend(selected_region, selected_product)
+
+    # Zooming re-resolves detail inside the visible range; a new selection starts unzoomed
+    x_range = None
+    if relayout_data is not None and ctx.triggered_id == 'sales-trend-chart':
+        x_range = relayout_x_range(relayout_data)
+        if x_range is None and not relayout_data.get('xaxis.autorange'):
+            raise PreventUpdate
+    return drawn_trend(selected_region, selected_product, x_range, point_budget(graph_width))
+
+if TREND_FILTER_MODE == 'client':
+    # Dropdown changes are answered in the browser from the shipped cells
+    app.clientside_callback(
+        ClientsideFunction(namespace='client_filter', function_name='salesTrend'),
+        Output('sales-trend-chart', 'figure'),
+        [Input('region-dropdown', 'value'),
+         Input('product-dropdown', 'value'),
+         Input('sales-trend-data', 'data')]
+    )
+else:
+    app.callback(
+        Output('sales-trend-chart', 'figure'),
+        [Input('region-dropdown', 'value'),
+         Input('product-dropdown', 'value'),
+         Input('sales-trend-chart', 'relayoutData')],
+        [State('sales-trend-width', 'data')]
+    )(update_sales_trend)
+
+# Report the rendered graph width so the point budget follows the screen
+app.clientside_callback(
+    """
+    function(relayoutData) {
+        var graph = document.getElementById('sales-trend-chart');
+        return graph ? graph.offsetWidth : null;
+    }
+    """,
+    Output('sales-trend-width', 'data'),
+    Input('sales-trend-chart', 'relayoutData')
+)
+
+# The version the trend on screen was drawn at, read back from its figure
+app.clientside_callback(
+    """
+    function(figure) {
+        var meta = figure && figure.layout && figure.layout.meta;
+        return meta && meta.live_version !== undefined ? meta : null;
+    }
+    """,
+    Output('sales-trend-cursor', 'data'),
+    Input('sales-trend-chart', 'figure')
+)
+
+def totals_updates():
+    """Region pie and product bar updates, patching just their values where possible"""
+    if lazy_graphs.lazy:
+        # A lazy graph may still be a placeholder without traces to patch; the figures are built once per version
+        return lazy_graphs.figure('regional-sales-chart'), lazy_graphs.figure('product-bar')
+
+    regions, products = sales_cube.region_totals(), sales_cube.product_totals()
+    pie, bar = Patch(), Patch()
+    pie['data'][0]['labels'] = regions['region'].tolist()
+    pie['data'][0]['values'] = regions['sales'].tolist()
+    bar['data'][0]['x'] = products['product'].tolist()
+    bar['data'][0]['y'] = products['sales'].tolist()
+    bar['data'][0]['marker']['color'] = products['sales'].tolist()
+    return pie, bar
+
+def customer_updates(batches):
+    """Customer scatter, density heatmap and 3D scatter updates for a client that has seen all but ``batches``
+
+    The scatters get the new rows as Patches where possible; otherwise, and
+    for the heatmap (a fixed grid), the figures are built once per customers
+    version and sent whole.
+    """
+    heatmap = lazy_graphs.figure('satisfaction-heatmap')
+    frames = [b.customers for b in batches or () if b.customers is not None]
+    rows = pd.concat(frames) if frames else None
+    regions = getattr(rows['region'], 'cat', None) if rows is not None else None
+    mode = render_mode(live.customer_rows)
+    # Redraw when the figures hold typed arrays or may be lazy placeholders, when a region
+    # gains its 3D trace, or when the rendering strategy changes
+    if (rows is None or regions is None or lazy_graphs.lazy or live.source is None
+            or any(b.new_regions for b in batches)
+            or mode == 'binned' or mode != render_mode(live.customer_rows - len(rows))):
+        return lazy_graphs.figure('customer-scatter'), heatmap, lazy_graphs.figure('3d-scatter')
+
+    satisfaction = rows['satisfaction'].tolist()
+    scatter = Patch()
+    scatter['data'][0]['x'].extend(rows['age'].tolist())
+    scatter['data'][0]['y'].extend(rows['income'].tolist())
+    scatter['data'][0]['marker']['color'].extend(satisfaction)
+    scatter['data'][0]['marker']['size'].extend(satisfaction)
+    scatter['data'][0]['customdata'].extend(rows[['region', 'gender']].astype(object).values.tolist())
+
+    # One 3D trace per region present, in category order
+    traces = [region for region in regions.categories if region in live.customer_regions]
+    scatter_3d = Patch()
+    for region, group in rows.groupby('region', observed=True):
+        trace = scatter_3d['data'][traces.index(region)]
+        trace['x'].extend(group['age'].tolist())
+        trace['y'].extend(group['income'].tolist())
+        trace['z'].extend(group['satisfaction'].tolist())
+        trace['marker']['size'].extend(group['satisfaction'].tolist())
+    return scatter, heatmap, scatter_3d
+
+def trend_update(trend_cursor, selected_region, selected_product):
+    """The trend update for a client showing ``trend_cursor``: new points as a Patch, a redraw, or nothing"""
+    if trend_cursor is None or (trend_cursor['region'], trend_cursor['product']) != (selected_region, selected_product):
+        return drawn_trend(selected_region, selected_product)
+    if trend_cursor['live_version'] == live.version:
+        return no_update
+    if DOWNSAMPLE_METHOD:
+        return drawn_trend(selected_region, selected_product)
+
+    version, points = live.new_points(trend_cursor['live_version'], selected_region, selected_product)
+    if points is None:
+        return drawn_trend(selected_region, selected_product)
+    # Moving the version along keeps every later Patch starting after these points
+    trend = Patch()
+    trend['layout']['meta']['live_version'] = version
+    if len(points):
+        trend['data'][0]['x'].extend(points['date'].dt.strftime('%Y-%m-%d').tolist())
+        trend['data'][0]['y'].extend(points['sales'].tolist())
+    return trend
+
 @app.callback(
-    Output('sales-trend-chart', 'figure'),
-    [Input('region-dropdown', 'value'),
-     Input('product-dropdown', 'value')]
+    [Output('kpi-total-sales', 'children'),
+     Output('kpi-customers', 'children'),
+     Output('kpi-satisfaction', 'children'),
+     Output('kpi-days', 'children'),
+     Output('regional-sales-chart', 'figure', allow_duplicate=True),
+     Output('product-bar', 'figure', allow_duplicate=True),
+     Output('customer-scatter', 'figure', allow_duplicate=True),
+     Output('satisfaction-heatmap', 'figure', allow_duplicate=True),
+     Output('3d-scatter', 'figure', allow_duplicate=True),
+     Output('sales-trend-chart', 'figure', allow_duplicate=True),
+     Output('sales-trend-data', 'data'),
+     Output('live-cursor', 'data')],
+    [Input('live-interval', 'n_intervals'),
+     Input('refresh-button', 'n_clicks')],
+    [State('live-cursor', 'data'),
+     State('sales-trend-cursor', 'data'),
+     State('region-dropdown', 'value'),
+     State('product-dropdown', 'value')],
+    prevent_initial_call=True
 )
-def update_sales_trend(selected_region, selected_product):
-    filtered_df = sales_df[
-        (sales_df['region'] == selected_region) & 
-        (sales_df['product'] == selected_product)
-    ]
-    
-    fig = px.line(
-        filtered_df.groupby('date')['sales'].sum().reset_index(),
-        x='date', y='sales',
-        title=f"Sales Trend - {selected_region} {selected_product}",
-        color_discrete_sequence=['#3B82F6']
-    ).update_layout(
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        font=dict(size=12),
-        title_font_size=16
-    )
-    
-    return fig
+def refresh_live_data(n_intervals, n_clicks, cursor, trend_cursor, selected_region, selected_product):
+    """Send this client only what changed since its cursor; ingestion runs on its own thread"""
+    if ctx.triggered_id == 'refresh-button':
+        cursor, trend_cursor = None, None  # redraw everything from the latest data
+    cursor = cursor or {}
+
+    def read():
+        # Batches and figures are read while ingestion waits, so the new cursor covers exactly what is sent
+        since = cursor.get('version')
+        version, batches = live.batches_since(since) if since is not None else (live.version, None)
+        new_cursor = {'version': version, 'sales': live.sales_version, 'customers': live.customers_version}
+        customers = (no_update, no_update, no_update)
+        if new_cursor['customers'] != cursor.get('customers'):
+            customers = customer_updates(batches)
+        trend_data = no_update
+        if TREND_FILTER_MODE == 'client' and version != since:
+            cells = new_trend_cells(batches) if batches is not None else None
+            if batches is None:
+                trend_data = sales_trend_payload()
+            elif cells is not None:
+                # Only the new cells travel; the browser sums them onto what it has
+                trend_data = Patch()
+                trend_data['more'].append(cells)
+        return new_cursor, customers, trend_data
+
+    _, (new_cursor, customers, trend_data) = live.snapshot(read)
+    totals = (no_update, no_update)
+    if new_cursor['sales'] != cursor.get('sales'):
+        totals = totals_updates()
+
+    if TREND_FILTER_MODE == 'client':
+        # The browser redraws the trend from the shipped cells plus the new ones
+        return kpi_texts() + totals + customers + (no_update, trend_data, new_cursor)
+
+    # Only new trend points travel as a Patch; otherwise this client redraws the trend
+    trend = trend_update(trend_cursor, selected_region, selected_product)
+    return kpi_texts() + totals + customers + (trend, no_update, new_cursor)
+
+# Latency and payload metrics at /metrics (DASHBOARD_METRICS=1); registered last to see every callback
+instrument_from_env(app)
+# Callbacks on a bounded thread pool, latest selection wins (DASHBOARD_CALLBACK_WORKERS=<n>)
+run_on_pool_from_env(app)
+# gzip/brotli and ETag revalidation of responses (DASHBOARD_COMPRESS=0 disables)
+compress_responses_from_env(app)
 
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=8050)
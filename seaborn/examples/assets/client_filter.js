@@ -0,0 +1,100 @@
+/* Clientside filtering over typed-array datasets shipped by client_filter.py */
+(function() {
+    var ARRAYS = {
+        i1: Int8Array, u1: Uint8Array, i2: Int16Array, u2: Uint16Array,
+        i4: Int32Array, u4: Uint32Array, f4: Float32Array, f8: Float64Array
+    };
+    var decoded = new WeakMap();
+
+    function decode(column) {
+        if (decoded.has(column)) {
+            return decoded.get(column);
+        }
+        var raw = atob(column.bdata);
+        var bytes = new Uint8Array(raw.length);
+        for (var i = 0; i < raw.length; i++) {
+            bytes[i] = raw.charCodeAt(i);
+        }
+        var values = new ARRAYS[column.dtype](bytes.buffer);
+        decoded.set(column, values);
+        return values;
+    }
+
+    function codeOf(column, value) {
+        return column.categories.indexOf(String(value));
+    }
+
+    function isoDate(millis) {
+        return new Date(millis).toISOString().slice(0, 10);
+    }
+
+    function copyFigure(figure) {
+        return JSON.parse(JSON.stringify(figure));
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        client_filter: {
+            // Daily sales of one region/product pair from the cube's cells and any live cells since
+            salesTrend: function(region, product, data) {
+                if (!data) {
+                    return window.dash_clientside.no_update;
+                }
+                var totals = new Map();
+                [data].concat(data.more || []).forEach(function(chunk) {
+                    var columns = chunk.columns;
+                    var regions = decode(columns.region), products = decode(columns.product);
+                    var dates = decode(columns.date), sales = decode(columns.sales);
+                    var regionCode = codeOf(columns.region, region), productCode = codeOf(columns.product, product);
+                    for (var i = 0; i < chunk.rows; i++) {
+                        if (regions[i] === regionCode && products[i] === productCode) {
+                            var date = isoDate(dates[i]);
+                            totals.set(date, (totals.get(date) || 0) + sales[i]);
+                        }
+                    }
+                });
+
+                var x = Array.from(totals.keys()).sort(), y = x.map(function(date) { return totals.get(date); });
+
+                var figure = copyFigure(data.figure);
+                figure.data[0].x = x;
+                figure.data[0].y = y;
+                figure.layout.title.text = 'Sales Trend - ' + region + ' ' + product;
+                figure.layout.uirevision = region + '-' + product;
+                return figure;
+            },
+
+            // Bill histogram of one day/sex pair on the server's bin edges
+            billHistogram: function(day, sex, data) {
+                if (!data) {
+                    return window.dash_clientside.no_update;
+                }
+                var columns = data.columns, bins = data.bins;
+                var days = decode(columns.day), sexes = decode(columns.sex), bills = decode(columns.total_bill);
+                var dayCode = codeOf(columns.day, day), sexCode = codeOf(columns.sex, sex);
+
+                var counts = new Array(bins.n).fill(0);
+                for (var i = 0; i < data.rows; i++) {
+                    if (days[i] === dayCode && sexes[i] === sexCode && !isNaN(bills[i])) {
+                        var bin = Math.floor((bills[i] - bins.start) / bins.width);
+                        counts[Math.min(Math.max(bin, 0), bins.n - 1)] += 1;
+                    }
+                }
+
+                var centers = [], edges = [];
+                for (var b = 0; b < bins.n; b++) {
+                    var low = bins.start + b * bins.width;
+                    centers.push(low + bins.width / 2);
+                    edges.push([low, low + bins.width]);
+                }
+
+                var figure = copyFigure(data.figure);
+                figure.data[0].x = centers;
+                figure.data[0].y = counts;
+                figure.data[0].customdata = edges;
+                figure.data[0].width = bins.width;
+                figure.layout.title.text = '💳 Bill Distribution - ' + day + ' (' + sex + ')';
+                return figure;
+            }
+        }
+    });
+})();
@@ -0,0 +1,53 @@
+/* Revalidate callback responses with ETags (see wire_format.py)
+ *
+ * Keeps the last response of each callback output in this tab. The next
+ * request for that output carries If-None-Match; on 304 the kept body is
+ * handed to the renderer, so an unchanged figure is not downloaded again.
+ */
+(function() {
+    if (!window.fetch || !window.Headers || !window.Response) {
+        return;
+    }
+    var originalFetch = window.fetch.bind(window);
+    var responses = new Map();
+
+    function callbackOutput(input, init) {
+        var url = typeof input === 'string' ? input : input && input.url;
+        if (!url || url.indexOf('_dash-update-component') === -1 || !init ||
+                init.method !== 'POST' || typeof init.body !== 'string') {
+            return null;
+        }
+        try {
+            return JSON.parse(init.body).output || null;
+        } catch (e) {
+            return null;
+        }
+    }
+
+    window.fetch = function(input, init) {
+        var output = callbackOutput(input, init);
+        if (output === null) {
+            return originalFetch(input, init);
+        }
+        var kept = responses.get(output);
+        var headers = new Headers(init.headers || {});
+        if (kept) {
+            headers.set('If-None-Match', kept.etag);
+        }
+
+        return originalFetch(input, Object.assign({}, init, {headers: headers})).then(function(response) {
+            if (response.status === 304 && kept) {
+                return new Response(kept.body, {status: 200, headers: {'Content-Type': kept.type}});
+            }
+            var etag = response.headers.get('ETag');
+            if (response.status !== 200 || !etag) {
+                responses.delete(output);
+                return response;
+            }
+            return response.clone().text().then(function(body) {
+                responses.set(output, {etag: etag, body: body, type: response.headers.get('Content-Type')});
+                return response;
+            });
+        });
+    };
+})();
@@ -0,0 +1,24 @@
+/* Tag callback requests with an id of this page load (see callback_pool.py)
+ *
+ * The pool coalesces requests per tab, so two tabs of one browser, or
+ * clients behind one proxy, never cancel each other's callbacks.
+ */
+(function() {
+    if (!window.fetch || !window.Headers) {
+        return;
+    }
+    var tabId = window.crypto && window.crypto.randomUUID ? window.crypto.randomUUID()
+        : Date.now().toString(36) + Math.random().toString(36).slice(2);
+    var originalFetch = window.fetch.bind(window);
+
+    window.fetch = function(input, init) {
+        var url = typeof input === 'string' ? input : input && input.url;
+        if (!url || url.indexOf('_dash-update-component') === -1) {
+            return originalFetch(input, init);
+        }
+        init = init || {};
+        var headers = new Headers(init.headers || {});
+        headers.set('X-Dash-Tab', tabId);
+        return originalFetch(input, Object.assign({}, init, {headers: headers}));
+    };
+})();
@@ -0,0 +1,112 @@
+from itertools import cycle
+
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+
+# Row counts at which scatter charts switch rendering strategy
+SVG_POINT_LIMIT = 5_000
+WEBGL_POINT_LIMIT = 200_000
+
+SCATTER_GRID = (120, 120)
+SCATTER_3D_BINS = 16
+REGION_COLORS = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4']
+
+
+def render_mode(n_rows):
+    """Pick 'svg', 'webgl' or 'binned' for a scatter of ``n_rows`` points"""
+    if n_rows <= SVG_POINT_LIMIT:
+        return 'svg'
+    if n_rows <= WEBGL_POINT_LIMIT:
+        return 'webgl'
+    return 'binned'
+
+
+def _edges(values, bins):
+    lo, hi = np.nanmin(values), np.nanmax(values)
+    if lo == hi:
+        hi = lo + 1
+    return np.linspace(lo, hi, bins + 1)
+
+
+def _centers(edges):
+    return (edges[:-1] + edges[1:]) / 2
+
+
+def binned_mean_grid(x, y, weights, grid=SCATTER_GRID):
+    """Rasterize points onto a fixed grid; returns (x centers, y centers, counts, mean weight)"""
+    x_edges, y_edges = _edges(x, grid[0]), _edges(y, grid[1])
+    counts, _, _ = np.histogram2d(x, y, bins=[x_edges, y_edges])
+    sums, _, _ = np.histogram2d(x, y, bins=[x_edges, y_edges], weights=weights)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = np.where(counts > 0, sums / counts, np.nan)
+    # histogram2d is indexed [x, y]; heatmaps expect rows along y
+    return _centers(x_edges), _centers(y_edges), counts.T, means.T
+
+
+def customer_scatter(customer_df, mode=None, grid=SCATTER_GRID):
+    """Age vs income colored by satisfaction, binned to a grid for large tables"""
+    mode = mode or render_mode(len(customer_df))
+    title = "Customer Age vs Income (colored by satisfaction)"
+
+    if mode != 'binned':
+        return px.scatter(
+            customer_df, x='age', y='income', color='satisfaction',
+            size='satisfaction', hover_data=['region', 'gender'],
+            title=title,
+            color_continuous_scale='Viridis',
+            render_mode='webgl' if mode == 'webgl' else 'auto'
+        )
+
+    xs, ys, counts, means = binned_mean_grid(
+        customer_df['age'].to_numpy(), customer_df['income'].to_numpy(),
+        customer_df['satisfaction'].to_numpy(), grid
+    )
+    fig = go.Figure(go.Heatmap(
+        x=xs, y=ys, z=means, customdata=counts,
+        colorscale='Viridis', colorbar=dict(title='satisfaction'),
+        hovertemplate="age %{x:.0f}<br>income %{y:,.0f}<br>"
+                      "satisfaction %{z:.2f}<br>customers %{customdata:,.0f}<extra></extra>"
+    ))
+    return fig.update_layout(title=f"{title} - {len(customer_df):,} customers binned",
+                             xaxis_title='age', yaxis_title='income')
+
+
+def customer_scatter_3d(customer_df, mode=None, bins=SCATTER_3D_BINS):
+    """3D age/income/satisfaction scatter, aggregated into voxels for large tables"""
+    mode = mode or render_mode(len(customer_df))
+    title = "3D Customer Analysis"
+
+    # scatter_3d already renders with WebGL, so only the binned mode differs
+    if mode != 'binned':
+        # Traces follow the region categories' order, so live updates can address them by position
+        regions = getattr(customer_df['region'], 'cat', None)
+        return px.scatter_3d(
+            customer_df, x='age', y='income', z='satisfaction',
+            color='region', size='satisfaction',
+            title=title,
+            color_discrete_sequence=REGION_COLORS,
+            category_orders={'region': list(regions.categories)} if regions is not None else None
+        )
+
+    columns = ['age', 'income', 'satisfaction']
+    edges = [_edges(customer_df[c].to_numpy(), bins) for c in columns]
+    centers = [_centers(e) for e in edges]
+
+    fig = go.Figure()
+    groups = customer_df.groupby('region', observed=True, sort=False)
+    for (region, group), color in zip(groups, cycle(REGION_COLORS)):
+        counts, _ = np.histogramdd(group[columns].to_numpy(), bins=edges)
+        ix, iy, iz = np.nonzero(counts)
+        n = counts[ix, iy, iz]
+        fig.add_trace(go.Scatter3d(
+            x=centers[0][ix], y=centers[1][iy], z=centers[2][iz],
+            mode='markers', name=str(region), customdata=n,
+            marker=dict(size=3 + 12 * np.sqrt(n / counts.max()), color=color, opacity=0.7),
+            hovertemplate="customers %{customdata:,.0f}<extra>%{fullData.name}</extra>"
+        ))
+
+    return fig.update_layout(
+        title=f"{title} - {len(customer_df):,} customers binned",
+        scene=dict(xaxis_title='age', yaxis_title='income', zaxis_title='satisfaction')
+    )
@@ -0,0 +1,284 @@
+import bisect
+import cProfile
+import heapq
+import io
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from dash.exceptions import PreventUpdate
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+_local = threading.local()
+
+
+class Histogram:
+    """Prometheus-style cumulative histogram with labels"""
+
+    def __init__(self, name, help_text, buckets, label_names):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self.label_names = tuple(label_names)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels[n]) for n in self.label_names)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            i = bisect.bisect_left(self.buckets, value)
+            if i < len(self.buckets):
+                series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._series.items()):
+                labels = ','.join(f'{n}="{v}"' for n, v in zip(self.label_names, key))
+                sep = ',' if labels else ''
+                cumulative = 0
+                for bound, n in zip(self.buckets, counts):
+                    cumulative += n
+                    lines.append(f'{self.name}_bucket{{{labels}{sep}le="{bound:g}"}} {cumulative}')
+                lines.append(f'{self.name}_bucket{{{labels}{sep}le="+Inf"}} {count}')
+                lines.append(f'{self.name}_sum{{{labels}}} {total:.9g}')
+                lines.append(f'{self.name}_count{{{labels}}} {count}')
+        return lines
+
+
+class Counter:
+    """Monotonic counter with labels"""
+
+    def __init__(self, name, help_text, label_names):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels[n]) for n in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                labels = ','.join(f'{n}="{v}"' for n, v in zip(self.label_names, key))
+                lines.append(f'{self.name}{{{labels}}} {value}')
+        return lines
+
+
+class Gauge:
+    """Gauge whose value is read from a callable at scrape time"""
+
+    def __init__(self, name, help_text, read):
+        self.name = name
+        self.help = help_text
+        self.read = read
+
+    def render(self):
+        return [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} gauge',
+                f'{self.name} {float(self.read()):.9g}']
+
+
+class MetricsRegistry:
+    """Callback latency, per-phase timing and response size metrics"""
+
+    def __init__(self):
+        self.callback_seconds = Histogram(
+            'dash_callback_seconds', 'Wall time of a callback including JSON encoding',
+            LATENCY_BUCKETS, ['callback'])
+        self.phase_seconds = Histogram(
+            'dash_callback_phase_seconds', 'Time spent in each phase of a callback',
+            LATENCY_BUCKETS, ['callback', 'phase'])
+        self.response_bytes = Histogram(
+            'dash_callback_response_bytes', 'Size of the JSON response of a callback',
+            SIZE_BUCKETS, ['callback'])
+        self.calls = Counter(
+            'dash_callback_calls_total', 'Callback calls by outcome (ok, prevented, error)',
+            ['callback', 'outcome'])
+        self.gauges = []
+        self.extra = []
+
+    def gauge(self, name, help_text, read):
+        """Expose ``read()`` as a gauge on the metrics endpoint"""
+        self.gauges.append(Gauge(name, help_text, read))
+
+    def histogram(self, name, help_text, buckets, label_names):
+        """Register and return an additional histogram"""
+        metric = Histogram(name, help_text, buckets, label_names)
+        self.extra.append(metric)
+        return metric
+
+    def counter(self, name, help_text, label_names):
+        """Register and return an additional counter"""
+        metric = Counter(name, help_text, label_names)
+        self.extra.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in (self.callback_seconds, self.phase_seconds, self.response_bytes, self.calls, *self.extra):
+            lines.extend(metric.render())
+        for gauge in self.gauges:
+            lines.extend(gauge.render())
+        return '\n'.join(lines) + '\n'
+
+
+@contextmanager
+def phase(name):
+    """Time a phase ('filter', 'aggregate', 'figure', ...) of the running callback
+
+    Costs almost nothing when the app is not instrumented.
+    """
+    phases = getattr(_local, 'phases', None)
+    if phases is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        phases[name] = phases.get(name, 0.0) + time.perf_counter() - start
+
+
+class _SlowestProfiles:
+    """Keeps the cProfile output of the ``keep`` slowest calls on disk"""
+
+    def __init__(self, directory, keep=5):
+        self.directory = directory
+        self.keep = keep
+        self._heap = []
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def offer(self, seconds, callback, profile):
+        with self._lock:
+            if len(self._heap) >= self.keep and seconds <= self._heap[0][0]:
+                return
+            stem = os.path.join(self.directory, f'{callback}-{seconds * 1e3:.1f}ms-{time.time_ns()}')
+            profile.dump_stats(stem + '.prof')
+            out = io.StringIO()
+            pstats.Stats(profile, stream=out).sort_stats('cumulative').print_stats(30)
+            with open(stem + '.txt', 'w') as f:
+                f.write(out.getvalue())
+
+            heapq.heappush(self._heap, (seconds, stem))
+            if len(self._heap) > self.keep:
+                _, evicted = heapq.heappop(self._heap)
+                for suffix in ('.prof', '.txt'):
+                    try:
+                        os.remove(evicted + suffix)
+                    except OSError:
+                        pass
+
+
+def _patch_json_encoder():
+    """Time Plotly's JSON encoder, which Dash uses to serialize callback output"""
+    import plotly.io.json as pio_json
+
+    original = pio_json.to_json_plotly
+    if getattr(original, '_timed', False):
+        return
+
+    @wraps(original)
+    def to_json_plotly(*args, **kwargs):
+        phases = getattr(_local, 'phases', None)
+        if phases is None:
+            return original(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            phases['encode'] = phases.get('encode', 0.0) + time.perf_counter() - start
+
+    to_json_plotly._timed = True
+    pio_json.to_json_plotly = to_json_plotly
+
+
+def callback_labels(callback_map):
+    """Metric label per server-side callback key: the function name, plus the outputs when shared"""
+    names = {}
+    for key, entry in callback_map.items():
+        if 'callback' not in entry:
+            continue  # clientside callbacks never reach the server
+        names.setdefault(entry['callback'].__name__, []).append(key)
+    labels = {}
+    for name, keys in names.items():
+        for key in keys:
+            labels[key] = name if len(keys) == 1 else f'{name}[{key.strip(".")}]'
+    return labels
+
+
+def instrument(app, registry=None, profile_dir=None, keep_profiles=5, path='/metrics'):
+    """Wrap every callback registered on ``app`` and serve metrics at ``path``
+
+    Call after all callbacks are registered. With ``profile_dir`` each call
+    also runs under cProfile and the slowest ``keep_profiles`` are written there.
+    """
+    registry = registry or MetricsRegistry()
+    profiles = _SlowestProfiles(profile_dir, keep_profiles) if profile_dir else None
+    _patch_json_encoder()
+
+    for key, label in callback_labels(app.callback_map).items():
+        entry = app.callback_map[key]
+        entry['callback'] = _wrap(entry['callback'], label, registry, profiles)
+
+    @app.server.route(path)
+    def metrics():
+        return registry.render(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
+    app.metrics = registry
+    return registry
+
+
+def _wrap(callback, label, registry, profiles):
+    @wraps(callback)
+    def timed(*args, **kwargs):
+        _local.phases = {}
+        profile = cProfile.Profile() if profiles else None
+        outcome = 'error'
+        start = time.perf_counter()
+        try:
+            if profile:
+                profile.enable()
+            result = callback(*args, **kwargs)
+            outcome = 'ok'
+            if isinstance(result, (str, bytes)):
+                registry.response_bytes.observe(len(result), callback=label)
+            return result
+        except PreventUpdate:
+            outcome = 'prevented'
+            raise
+        finally:
+            if profile:
+                profile.disable()
+            elapsed = time.perf_counter() - start
+            registry.callback_seconds.observe(elapsed, callback=label)
+            registry.calls.inc(callback=label, outcome=outcome)
+            for name, seconds in _local.phases.items():
+                registry.phase_seconds.observe(seconds, callback=label, phase=name)
+            _local.phases = None
+            if profile and outcome == 'ok':
+                profiles.offer(elapsed, label, profile)
+
+    return timed
+
+
+def instrument_from_env(app):
+    """Instrument when DASHBOARD_METRICS=1; DASHBOARD_PROFILE_DIR adds cProfile dumps"""
+    if os.environ.get('DASHBOARD_METRICS', '').lower() not in ('1', 'true', 'yes'):
+        return None
+    return instrument(app, profile_dir=os.environ.get('DASHBOARD_PROFILE_DIR') or None)
@@ -0,0 +1,210 @@
+"""Run Dash callbacks on a bounded local thread pool and coalesce stale requests
+
+Every server-side callback is submitted to a ``ThreadPoolExecutor`` of
+``max_workers`` threads; the request thread only waits for the result. Per
+tab (the ``X-Dash-Tab`` header set by ``assets/tab_id.js``) and callback
+output:
+
+* a request whose inputs equal those of the pending one shares its result,
+* a newer selection cancels the older request if it has not started yet
+  (the older request answers with no update), and marks it superseded if it
+  is running, so ``raise_if_superseded()`` can stop it between phases,
+* at most ``max_queue`` calls wait for a worker; more are answered with a
+  503 and ``Retry-After``.
+
+Requests without a tab id (no JavaScript, scripted clients) run without
+coalescing.
+
+Queue depth, busy workers, wait time and coalescing counts are added to the
+``callback_metrics`` registry when the app is instrumented.
+
+Enabled with DASHBOARD_CALLBACK_WORKERS=<n> (DASHBOARD_CALLBACK_QUEUE, default 32).
+"""
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from functools import wraps
+
+import flask
+from dash.exceptions import PreventUpdate
+
+from callback_metrics import LATENCY_BUCKETS, callback_labels
+
+TAB_HEADER = 'X-Dash-Tab'
+
+_local = threading.local()
+
+
+class CallbackQueueFull(RuntimeError):
+    """More callbacks are waiting than the pool's ``max_queue``"""
+
+
+class _Job:
+    __slots__ = ('future', 'inputs', 'submitted', 'superseded')
+
+    def __init__(self, inputs):
+        self.future = None
+        self.inputs = inputs
+        self.submitted = time.perf_counter()
+        self.superseded = False
+
+
+def raise_if_superseded():
+    """Stop the running callback with no update once a newer request replaced it
+
+    A no-op outside the pool, so callbacks may call it unconditionally.
+    """
+    job = getattr(_local, 'job', None)
+    if job is not None and job.superseded:
+        raise PreventUpdate
+
+
+def _inputs_key(args):
+    try:
+        return repr(args)
+    except Exception:
+        return object()  # never equal: no sharing
+
+
+class CallbackPool:
+    """Bounded executor with per-client, per-output coalescing"""
+
+    def __init__(self, max_workers=4, max_queue=32, registry=None):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix='dash-callback')
+        self._lock = threading.Lock()
+        self._latest = {}
+        self.queued = 0
+        self.running = 0
+
+        self.wait_seconds = self.outcomes = None
+        if registry is not None:
+            self.wait_seconds = registry.histogram(
+                'dash_callback_queue_wait_seconds', 'Time a callback waited for a pool worker',
+                LATENCY_BUCKETS, ['callback'])
+            self.outcomes = registry.counter(
+                'dash_callback_coalesced_total', 'Requests shared, cancelled, superseded or rejected by the pool',
+                ['callback', 'reason'])
+            registry.gauge('dash_callback_queue_depth', 'Callbacks waiting for a pool worker', lambda: self.queued)
+            registry.gauge('dash_callback_pool_busy', 'Pool workers running a callback', lambda: self.running)
+            registry.gauge('dash_callback_pool_workers', 'Size of the callback pool', lambda: self.max_workers)
+
+    def _count(self, label, reason):
+        if self.outcomes is not None:
+            self.outcomes.inc(callback=label, reason=reason)
+
+    def stats(self):
+        return {'workers': self.max_workers, 'queued': self.queued, 'running': self.running}
+
+    def _run(self, job, label, context, callback, args, kwargs):
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+        if self.wait_seconds is not None:
+            self.wait_seconds.observe(time.perf_counter() - job.submitted, callback=label)
+        _local.job = job
+        try:
+            result = context.run(callback, *args, **kwargs)
+            if job.superseded:
+                # The browser already asked for something newer: skip sending this one
+                raise PreventUpdate
+            return result
+        except PreventUpdate:
+            if job.superseded:
+                self._count(label, 'superseded')
+            raise
+        finally:
+            _local.job = None
+            with self._lock:
+                self.running -= 1
+
+    def call(self, label, client, callback, args, kwargs):
+        """Run ``callback`` on the pool and wait for it; the latest request per client and label wins
+
+        With ``client=None`` the call is neither shared nor cancelled.
+        """
+        key = (label, client)
+        inputs = _inputs_key(args)
+        with self._lock:
+            latest = None if client is None else self._latest.get(key)
+            if latest is not None and not latest.future.done() and latest.inputs == inputs:
+                job = latest
+                self._count(label, 'shared')
+            else:
+                if latest is not None and not latest.future.done():
+                    if latest.future.cancel():
+                        self.queued -= 1
+                        self._count(label, 'cancelled')
+                    else:
+                        latest.superseded = True
+                if self.queued >= self.max_queue:
+                    self._count(label, 'rejected')
+                    raise CallbackQueueFull(f"{self.queued} callbacks already waiting for a worker")
+
+                job = _Job(inputs)
+                run = self._run
+                if flask.has_request_context():
+                    run = flask.copy_current_request_context(run)
+                self.queued += 1
+                job.future = self._executor.submit(run, job, label, contextvars.copy_context(),
+                                                   callback, args, kwargs)
+                if client is not None:
+                    self._latest[key] = job
+
+        try:
+            return job.future.result()
+        except CancelledError:
+            raise PreventUpdate
+        finally:
+            with self._lock:
+                if self._latest.get(key) is job and job.future.done():
+                    del self._latest[key]
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+def _client_id():
+    """The requesting tab's id, or ``None``; never shared between tabs or clients"""
+    if not flask.has_request_context():
+        return None
+    return flask.request.headers.get(TAB_HEADER, '')[:64] or None
+
+
+def run_on_pool(app, max_workers=4, max_queue=32, registry=None):
+    """Move every server-side callback of ``app`` onto a ``CallbackPool``
+
+    Call after all callbacks are registered and after ``instrument`` so the
+    pool's metrics join the instrumented registry (``app.metrics``).
+    """
+    pool = CallbackPool(max_workers, max_queue, registry or getattr(app, 'metrics', None))
+
+    for key, label in callback_labels(app.callback_map).items():
+        entry = app.callback_map[key]
+        entry['callback'] = _submit(entry['callback'], label, pool)
+
+    @app.server.errorhandler(CallbackQueueFull)
+    def queue_full(error):
+        return flask.Response(str(error), status=503, headers={'Retry-After': '1'}, mimetype='text/plain')
+
+    app.callback_pool = pool
+    return pool
+
+
+def _submit(callback, label, pool):
+    @wraps(callback)
+    def pooled(*args, **kwargs):
+        return pool.call(label, _client_id(), callback, args, kwargs)
+
+    return pooled
+
+
+def run_on_pool_from_env(app):
+    """Use a pool when DASHBOARD_CALLBACK_WORKERS is a positive number"""
+    workers = int(os.environ.get('DASHBOARD_CALLBACK_WORKERS') or 0)
+    if workers <= 0:
+        return None
+    return run_on_pool(app, workers, int(os.environ.get('DASHBOARD_CALLBACK_QUEUE') or 32))
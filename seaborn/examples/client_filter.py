@@ -0,0 +1,95 @@
+"""Ship a small dataset to the browser once and filter it in clientside callbacks
+
+Columns are encoded as base64 typed arrays (``{'dtype': 'f8', 'bdata': ...}``,
+the layout plotly.js uses) with categorical columns sent as integer codes
+plus their category list. ``assets/client_filter.js`` decodes them, so dropdown
+changes are answered in the browser with no request to the server.
+
+DASHBOARD_FILTER_MODE selects 'server', 'client' or 'auto' (default). Auto
+ships the data when its encoded size is at most ``CLIENT_MAX_BYTES``.
+"""
+import base64
+import copy
+import os
+
+import numpy as np
+import pandas as pd
+from plotly.io.json import to_json_plotly
+
+FILTER_MODES = ('auto', 'client', 'server')
+CLIENT_MAX_BYTES = 2_000_000
+
+# Typed array names understood by assets/client_filter.js
+_TYPED = {np.dtype(t): name for t, name in [
+    (np.int8, 'i1'), (np.uint8, 'u1'), (np.int16, 'i2'), (np.uint16, 'u2'),
+    (np.int32, 'i4'), (np.uint32, 'u4'), (np.float32, 'f4'), (np.float64, 'f8'),
+]}
+
+
+def filter_mode_setting():
+    mode = os.environ.get('DASHBOARD_FILTER_MODE', 'auto').lower()
+    if mode not in FILTER_MODES:
+        raise ValueError(f"DASHBOARD_FILTER_MODE must be one of {FILTER_MODES}, not {mode!r}")
+    return mode
+
+
+def payload_bytes(payload):
+    """Size of ``payload`` as Dash will send it"""
+    return len(to_json_plotly(payload))
+
+
+def choose_filter_mode(payload, mode=None, max_bytes=CLIENT_MAX_BYTES):
+    """'client' if ``payload`` should be shipped to the browser, else 'server'
+
+    ``None`` stands for data that cannot be filtered clientside.
+    """
+    mode = mode or filter_mode_setting()
+    if payload is None:
+        return 'server'
+    if mode == 'auto':
+        return 'client' if payload_bytes(payload) <= max_bytes else 'server'
+    return mode
+
+
+def encode_array(values):
+    """Base64 typed array of a numeric NumPy array (int64 is narrowed to int32 or float64)"""
+    values = np.asarray(values)
+    if values.dtype == np.bool_:
+        values = values.astype(np.uint8)
+    elif values.dtype.kind in 'iu' and values.dtype not in _TYPED:
+        fits = values.size == 0 or (values.min() >= -2 ** 31 and values.max() < 2 ** 31)
+        values = values.astype(np.int32 if fits else np.float64)
+    elif values.dtype not in _TYPED:
+        values = values.astype(np.float64)
+    values = np.ascontiguousarray(values, dtype=values.dtype.newbyteorder('<'))
+    return {'dtype': _TYPED[np.dtype(values.dtype.str[1:])], 'bdata': base64.b64encode(values.tobytes()).decode()}
+
+
+def encode_column(series):
+    """Typed-array encoding of a column; categoricals and strings become codes plus categories"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        # Milliseconds since the epoch, the unit of JavaScript dates
+        millis = series.to_numpy().astype('datetime64[ms]').astype(np.int64).astype(np.float64)
+        return dict(encode_array(millis), kind='datetime')
+    if pd.api.types.is_numeric_dtype(series) and not isinstance(series.dtype, pd.CategoricalDtype):
+        return dict(encode_array(series.to_numpy()), kind='numeric')
+
+    categorical = pd.Categorical(series)
+    n = len(categorical.categories)
+    codes = categorical.codes.astype(np.int8 if n < 127 else np.int16 if n < 32767 else np.int32)
+    return dict(encode_array(codes), kind='category', categories=[str(c) for c in categorical.categories])
+
+
+def encode_frame(df):
+    """Columnar, typed-array encoding of ``df`` for a ``dcc.Store``"""
+    return {'rows': len(df), 'columns': {name: encode_column(df[name]) for name in df.columns}}
+
+
+def figure_template(figure):
+    """Copy of a figure dict whose traces keep their style but carry no data"""
+    figure = copy.deepcopy(figure.to_dict() if hasattr(figure, 'to_dict') else figure)
+    for trace in figure['data']:
+        for key in ('x', 'y', 'customdata'):
+            if key in trace:
+                trace[key] = []
+    return figure
@@ -0,0 +1,156 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Shared schema for the synthetic dashboard data
+REGIONS = np.array(['North', 'South', 'East', 'West'], dtype=object)
+PRODUCTS = np.array(['Electronics', 'Clothing', 'Books', 'Home'], dtype=object)
+CUSTOMER_TYPES = np.array(['Premium', 'Standard', 'Basic'], dtype=object)
+GENDERS = np.array(['Male', 'Female'], dtype=object)
+
+# Compact column types: string columns are categorical codes, numerics float32
+REGION_DTYPE = pd.CategoricalDtype(REGIONS)
+PRODUCT_DTYPE = pd.CategoricalDtype(PRODUCTS)
+CUSTOMER_TYPE_DTYPE = pd.CategoricalDtype(CUSTOMER_TYPES)
+GENDER_DTYPE = pd.CategoricalDtype(GENDERS)
+SALES_DTYPES = {'date': 'datetime64[ns]', 'sales': np.float32, 'region': REGION_DTYPE,
+                'product': PRODUCT_DTYPE, 'customer_type': CUSTOMER_TYPE_DTYPE}
+CUSTOMER_DTYPES = {'age': np.float32, 'income': np.float32, 'satisfaction': np.float32,
+                   'region': REGION_DTYPE, 'gender': GENDER_DTYPE}
+
+START_DATE = '2023-01-01'
+END_DATE = '2023-12-31'
+DEFAULT_SEED = 42
+DEFAULT_CUSTOMERS = 1000
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+
+def _date_range(start=START_DATE, end=END_DATE):
+    return pd.date_range(start=start, end=end, freq='D')
+
+
+def _codes(rng, dtype, size):
+    return pd.Categorical.from_codes(rng.integers(0, len(dtype.categories), size).astype(np.int8), dtype=dtype)
+
+
+def _sales_chunk(rng, row_start, row_stop, n_rows, dates):
+    """Build one block of sales rows; row positions map evenly onto the date range"""
+    positions = np.arange(row_start, row_stop, dtype=np.int64)
+    day_index = positions * len(dates) // n_rows
+    chunk_dates = dates[day_index]
+
+    size = row_stop - row_start
+    base_sales = 1000 + rng.normal(0, 200, size)
+    seasonal_factor = 1 + 0.3 * np.sin(2 * np.pi * chunk_dates.dayofyear.to_numpy() / 365)
+
+    return pd.DataFrame({
+        'date': chunk_dates.astype('datetime64[ns]'),
+        'sales': np.maximum(0, base_sales * seasonal_factor).astype(np.float32),
+        'region': _codes(rng, REGION_DTYPE, size),
+        'product': _codes(rng, PRODUCT_DTYPE, size),
+        'customer_type': _codes(rng, CUSTOMER_TYPE_DTYPE, size)
+    })
+
+
+def _chunk_rngs(seed, n_chunks):
+    """Independent, reproducible generator per chunk so output does not depend on chunk order"""
+    return [np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(n_chunks)]
+
+
+def iter_sales_chunks(n_rows=None, chunk_size=DEFAULT_CHUNK_SIZE, seed=DEFAULT_SEED,
+                      start=START_DATE, end=END_DATE):
+    """Yield the sales table as DataFrames of at most ``chunk_size`` rows"""
+    dates = _date_range(start, end)
+    if n_rows is None:
+        n_rows = len(dates)
+
+    n_chunks = max(1, -(-n_rows // chunk_size))
+    for i, rng in enumerate(_chunk_rngs(seed, n_chunks)):
+        row_start = i * chunk_size
+        row_stop = min(n_rows, row_start + chunk_size)
+        yield _sales_chunk(rng, row_start, row_stop, n_rows, dates)
+
+
+def generate_sales_data(n_rows=None, seed=DEFAULT_SEED, chunk_size=DEFAULT_CHUNK_SIZE,
+                        start=START_DATE, end=END_DATE):
+    """Generate the sales table in memory (one row per day by default)"""
+    chunks = list(iter_sales_chunks(n_rows, chunk_size, seed, start, end))
+    if len(chunks) == 1:
+        return chunks[0]
+    return pd.concat(chunks, ignore_index=True)
+
+
+def generate_sales_batch(dates, rows_per_day=1, rng=None):
+    """Sales rows for the given dates, e.g. the next micro-batch of a live feed"""
+    dates = pd.DatetimeIndex(dates)
+    n_rows = len(dates) * rows_per_day
+    return _sales_chunk(rng or np.random.default_rng(), 0, n_rows, n_rows, dates)
+
+
+def generate_customer_data(n_customers=DEFAULT_CUSTOMERS, seed=DEFAULT_SEED):
+    """Generate customer demographics with NumPy-batched draws"""
+    rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng([seed, 1])
+
+    return pd.DataFrame({
+        'age': rng.normal(35, 12, n_customers).astype(np.float32),
+        'income': rng.normal(50000, 20000, n_customers).astype(np.float32),
+        'satisfaction': rng.uniform(1, 5, n_customers).astype(np.float32),
+        'region': _codes(rng, REGION_DTYPE, n_customers),
+        'gender': _codes(rng, GENDER_DTYPE, n_customers)
+    })
+
+
+def apply_schema(df, dtypes):
+    """Cast ``df`` (e.g. rows parsed from CSV) to the compact column types
+
+    Values missing from a declared category list are kept by extending the
+    categories, so foreign labels are never turned into NaN.
+    """
+    casts = {}
+    for column, dtype in dtypes.items():
+        if column not in df or df[column].dtype == dtype:
+            continue
+        if isinstance(dtype, pd.CategoricalDtype):
+            unknown = pd.Index(df[column].dropna().unique()).difference(dtype.categories)
+            if len(unknown):
+                dtype = pd.CategoricalDtype(dtype.categories.append(unknown))
+        casts[column] = dtype
+    return df.astype(casts) if casts else df
+
+
+def category_mask(series, value):
+    """Boolean mask of ``series == value``, comparing integer codes for categoricals"""
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return (series == value).to_numpy()
+    codes = series.cat.codes.to_numpy()
+    categories = series.cat.categories
+    if value not in categories:
+        return np.zeros(len(codes), dtype=bool)
+    return codes == categories.get_loc(value)
+
+
+def date_slice(df, start=None, end=None, column='date'):
+    """Rows with ``start <= date <= end`` of a frame sorted by ``column``, by binary search"""
+    dates = df[column].to_numpy()
+    lo = 0 if start is None else np.searchsorted(dates, np.datetime64(pd.Timestamp(start)), 'left')
+    hi = len(dates) if end is None else np.searchsorted(dates, np.datetime64(pd.Timestamp(end)), 'right')
+    return df.iloc[lo:hi]
+
+
+def write_sales_chunks(path, n_rows, chunk_size=DEFAULT_CHUNK_SIZE, seed=DEFAULT_SEED):
+    """Stream the sales table to a CSV file without holding it in memory; returns rows written"""
+    written = 0
+    if os.path.exists(path):
+        os.remove(path)
+
+    for chunk in iter_sales_chunks(n_rows, chunk_size, seed):
+        chunk.to_csv(path, mode='a', header=written == 0, index=False)
+        written += len(chunk)
+
+    return written
+
+
+def generate_sample_data(n_rows=None, n_customers=DEFAULT_CUSTOMERS, seed=DEFAULT_SEED):
+    """Generate comprehensive sample data for the dashboard"""
+    return generate_sales_data(n_rows, seed), generate_customer_data(n_customers, seed)
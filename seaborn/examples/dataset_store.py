@@ -0,0 +1,282 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+EXAMPLES_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(os.path.dirname(EXAMPLES_DIR))
+CACHE_DIR = os.environ.get('DATASET_CACHE_DIR', os.path.join(EXAMPLES_DIR, '.dataset_cache'))
+MANIFEST = 'manifest.json'
+
+# Local sources: tips and iris are the seaborn datasets, vendored for offline use
+DATASETS = {
+    'tips': os.path.join(EXAMPLES_DIR, 'data', 'tips.csv'),
+    'iris': os.path.join(EXAMPLES_DIR, 'data', 'iris.csv'),
+    'bootcamp_applicants': os.path.join(REPO_DIR, '10_pie_histogram', 'bootcamp_applicants_500.csv'),
+    'climate_energy': os.path.join(REPO_DIR, '11_box__scater_plot', 'climate_energy_morocco_5years.csv'),
+    'revenue': os.path.join(REPO_DIR, '5_project_plot', 'revenue_100.csv'),
+    'literacy_regions': os.path.join(REPO_DIR, '6_bar_chart_project', 'morocco_literacy_regions_2024.csv'),
+    'saas_users': os.path.join(REPO_DIR, '7_project_bar_plot', 'saas_users_hard_100.csv'),
+}
+
+# Declared column types; tips gets the ordered categories seaborn.load_dataset applies.
+# The course CSVs (also loaded by the notebooks through course_data.py) get categoricals and narrow numerics
+DTYPES = {
+    'tips': {
+        'day': pd.CategoricalDtype(['Thur', 'Fri', 'Sat', 'Sun']),
+        'sex': pd.CategoricalDtype(['Male', 'Female']),
+        'time': pd.CategoricalDtype(['Lunch', 'Dinner']),
+        'smoker': pd.CategoricalDtype(['Yes', 'No']),
+    },
+    'bootcamp_applicants': {
+        'age': 'int16',
+        'gender': 'category',
+        'city': 'category',
+        'education_level': pd.CategoricalDtype(['High school', 'Bachelor', 'Master', 'PhD'], ordered=True),
+        'field_of_study': 'category',
+        'programming_experience': 'int16',
+        'motivation': 'category',
+        'accepted': 'category',
+    },
+    'climate_energy': {
+        'region': pd.CategoricalDtype(['North', 'Center', 'South']),
+        'temperature_c': 'float32',
+        'energy_kwh': 'float32',
+        'season': pd.CategoricalDtype(['Winter', 'Spring', 'Summer', 'Autumn']),
+    },
+    'revenue': {'revenue': 'float64'},
+    'literacy_regions': {
+        'region': 'category',
+        'illiteracy_rate_percent': 'float32',
+        'literacy_rate_percent': 'float32',
+        'female_literacy_percent': 'float32',
+        'gender_gap': 'float32',
+    },
+    'saas_users': {
+        'new_users': 'int32',
+        'active_users': 'int32',
+        'churned_users': 'int32',
+        'total_users': 'int32',
+    },
+}
+DATE_COLUMNS = {
+    'climate_energy': ['date'],
+    'revenue': ['date'],
+    'saas_users': ['date'],
+}
+
+
+class CacheError(Exception):
+    """Raised when a cached dataset is missing or fails validation"""
+
+
+def file_checksum(path, chunk_size=1 << 20):
+    """SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _codes_dtype(n_categories):
+    return np.int8 if n_categories < 127 else np.int16 if n_categories < 32767 else np.int32
+
+
+def write_columns(df, directory, extra=None):
+    """Write each column of ``df`` to its own ``.npy`` file plus a JSON manifest
+
+    Strings are stored as categorical codes (and restored as strings unless
+    the column already was categorical), datetimes as int64 nanoseconds, so
+    every column can later be memory-mapped. Several processes may write the
+    same directory at once; each writes to its own temporary directory.
+    """
+    parent = os.path.dirname(os.path.abspath(directory))
+    os.makedirs(parent, exist_ok=True)
+    tmp = tempfile.mkdtemp(prefix=os.path.basename(directory) + '.', suffix='.tmp', dir=parent)
+    try:
+        manifest = _write_columns(df, tmp, extra)
+        _swap_in(tmp, directory)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return manifest
+
+
+def _write_columns(df, tmp, extra):
+    columns = []
+    for i, name in enumerate(df.columns):
+        series = df[name]
+        entry = {'name': name, 'file': f'{i:03d}.npy'}
+        if isinstance(series.dtype, pd.CategoricalDtype) or not (
+                pd.api.types.is_numeric_dtype(series) or pd.api.types.is_datetime64_any_dtype(series)):
+            categorical = pd.Categorical(series)
+            entry['kind'] = 'category' if isinstance(series.dtype, pd.CategoricalDtype) else 'string'
+            entry['categories'] = [str(c) for c in categorical.categories]
+            entry['ordered'] = bool(categorical.ordered)
+            values = categorical.codes.astype(_codes_dtype(len(categorical.categories)))
+        elif pd.api.types.is_datetime64_any_dtype(series):
+            entry['kind'] = 'datetime'
+            values = series.to_numpy().astype('datetime64[ns]').view(np.int64)
+        else:
+            entry['kind'] = 'numeric'
+            values = series.to_numpy()
+
+        path = os.path.join(tmp, entry['file'])
+        np.save(path, np.ascontiguousarray(values), allow_pickle=False)
+        entry['sha256'] = file_checksum(path)
+        columns.append(entry)
+
+    manifest = dict(extra or {}, rows=len(df), columns=columns)
+    with open(os.path.join(tmp, MANIFEST), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def _swap_in(tmp, directory):
+    """Rename a finished directory into place so readers never see a half-written cache
+
+    An existing directory is first renamed aside. If another writer puts its
+    copy in place first, that copy is kept: it was built from the same source.
+    """
+    try:
+        os.rename(tmp, directory)
+        return
+    except OSError:
+        if not os.path.isdir(directory):
+            raise
+
+    old = tempfile.mkdtemp(prefix=os.path.basename(directory) + '.', suffix='.old', dir=os.path.dirname(tmp))
+    try:
+        try:
+            os.replace(directory, old)
+        except FileNotFoundError:
+            pass  # already moved aside by another writer
+        try:
+            os.rename(tmp, directory)
+        except OSError:
+            if not os.path.isdir(directory):
+                raise
+    finally:
+        shutil.rmtree(old, ignore_errors=True)
+
+
+def read_manifest(directory):
+    path = os.path.join(directory, MANIFEST)
+    if not os.path.exists(path):
+        raise CacheError(f"No cached columns in {directory}")
+    with open(path) as f:
+        return json.load(f)
+
+
+def read_columns(directory, mmap=True, verify=False):
+    """Load a directory written by ``write_columns`` as a DataFrame
+
+    With ``mmap`` numeric columns and categorical codes are read-only views
+    of the files (no copy); ``verify`` re-hashes every column file first.
+    """
+    manifest = read_manifest(directory)
+    data = {}
+    for entry in manifest['columns']:
+        path = os.path.join(directory, entry['file'])
+        if verify and file_checksum(path) != entry['sha256']:
+            raise CacheError(f"Checksum mismatch for column {entry['name']!r} in {directory}")
+
+        values = np.load(path, mmap_mode='r' if mmap else None, allow_pickle=False)
+        if entry['kind'] == 'category':
+            dtype = pd.CategoricalDtype(entry['categories'], ordered=entry['ordered'])
+            data[entry['name']] = pd.Categorical.from_codes(values, dtype=dtype)
+        elif entry['kind'] == 'string':
+            categories = np.array(entry['categories'] + [np.nan], dtype=object)
+            data[entry['name']] = categories[values]
+        elif entry['kind'] == 'datetime':
+            data[entry['name']] = values.view('datetime64[ns]')
+        else:
+            data[entry['name']] = values
+
+    return pd.DataFrame(data, copy=False)
+
+
+def read_source(name, path=None):
+    """Parse a dataset's source CSV with its declared types, bypassing the cache"""
+    return pd.read_csv(path or source_path(name), dtype=DTYPES.get(name),
+                       parse_dates=DATE_COLUMNS.get(name, False))
+
+
+def source_path(name):
+    """Locate a dataset's CSV: the repo copy, else seaborn's local data cache"""
+    path = DATASETS.get(name)
+    if path and os.path.exists(path):
+        return path
+
+    data_home = os.environ.get('SEABORN_DATA', os.path.join(os.path.expanduser('~'), '.cache', 'seaborn'))
+    path = os.path.join(data_home, f'{name}.csv')
+    if os.path.exists(path):
+        return path
+    raise FileNotFoundError(f"No local source for dataset {name!r}; add its CSV to DATASETS")
+
+
+def _source_stat(path):
+    """Modification time and size of a source, checked before re-hashing it"""
+    stat = os.stat(path)
+    return {'source_mtime_ns': stat.st_mtime_ns, 'source_size': stat.st_size}
+
+
+def _record_source_stat(directory, manifest, stat):
+    """Store a source's new stat after its checksum matched, so later loads skip the hash"""
+    tmp = os.path.join(directory, f'{MANIFEST}.{os.getpid()}.tmp')
+    try:
+        with open(tmp, 'w') as f:
+            json.dump(dict(manifest, **stat), f, indent=2)
+        os.replace(tmp, os.path.join(directory, MANIFEST))
+    except OSError:
+        pass  # e.g. a read-only cache: the next load hashes the source again
+
+
+def _schema(name):
+    """Fingerprint of a dataset's declared types, so changing them rebuilds its cache"""
+    return repr((DTYPES.get(name), DATE_COLUMNS.get(name)))
+
+
+def build_cache(name, cache_dir=CACHE_DIR):
+    """(Re)build the binary cache of one dataset from its CSV source"""
+    path = source_path(name)
+    # Taken before parsing, so a source written meanwhile fails the check and is hashed again
+    stat = _source_stat(path)
+    df = read_source(name, path)
+    write_columns(df, os.path.join(cache_dir, name),
+                  extra=dict(stat, source=path, source_sha256=file_checksum(path), schema=_schema(name)))
+    return df
+
+
+def load_dataset(name, cache_dir=CACHE_DIR, mmap=True, verify=False):
+    """Load a dataset offline, serving it from the binary cache when still valid
+
+    The cache is rebuilt whenever the source CSV's checksum or the declared
+    types change, or a cached column fails verification. The source is only
+    re-hashed when its modification time or size differ from the manifest's.
+    If the cache cannot be rebuilt (e.g. a read-only or full disk) the CSV is
+    parsed directly.
+    """
+    directory = os.path.join(cache_dir, name)
+    path = source_path(name)
+    try:
+        manifest = read_manifest(directory)
+        stat = _source_stat(path)
+        if any(manifest.get(key) != value for key, value in stat.items()):
+            if manifest.get('source_sha256') != file_checksum(path):
+                raise CacheError(f"Source of {name!r} changed")
+            _record_source_stat(directory, manifest, stat)
+        if manifest.get('schema') != _schema(name):
+            raise CacheError(f"Declared types of {name!r} changed")
+        return read_columns(directory, mmap=mmap, verify=verify)
+    except (CacheError, OSError, ValueError, EOFError):
+        pass
+    try:
+        build_cache(name, cache_dir)
+        return read_columns(directory, mmap=mmap)
+    except (CacheError, OSError, ValueError, EOFError):
+        return read_source(name, path)
@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+
+DEFAULT_POINTS_PER_PIXEL = 2
+DEFAULT_GRAPH_WIDTH = 800
+METHODS = ('lttb', 'minmax')
+
+
+def point_budget(width_px=None, points_per_pixel=DEFAULT_POINTS_PER_PIXEL):
+    """Number of points worth sending for a graph ``width_px`` pixels wide"""
+    width = int(width_px or DEFAULT_GRAPH_WIDTH)
+    return max(16, width * points_per_pixel)
+
+
+def _as_float(x):
+    """Numeric view of an x array; datetimes become int64 nanoseconds"""
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').astype(np.int64).astype(np.float64)
+    return x.astype(np.float64)
+
+
+def lttb_indices(x, y, n_out):
+    """Indices kept by Largest-Triangle-Three-Buckets for ``n_out`` output points"""
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    xf = _as_float(x)
+    yf = np.asarray(y, dtype=np.float64)
+    # First and last points are always kept; the rest is split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0] = 0
+    keep[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            nxt = slice(edges[i + 1], edges[i + 2])
+            cx, cy = xf[nxt].mean(), yf[nxt].mean()
+        else:
+            cx, cy = xf[-1], yf[-1]
+
+        bx, by = xf[start:stop], yf[start:stop]
+        area = np.abs((xf[a] - cx) * (by - yf[a]) - (xf[a] - bx) * (cy - yf[a]))
+        a = start + int(np.argmax(area))
+        keep[i + 1] = a
+
+    return keep
+
+
+def minmax_indices(x, y, n_out):
+    """Indices of the min and max of each bucket, ``n_out // 2`` buckets, in x order"""
+    n = len(y)
+    n_buckets = max(1, n_out // 2)
+    if n_out >= n:
+        return np.arange(n)
+
+    yf = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(0, n, n_buckets + 1).astype(np.int64)
+    keep = []
+    for start, stop in zip(edges[:-1], edges[1:]):
+        if stop <= start:
+            continue
+        bucket = yf[start:stop]
+        lo = start + int(np.argmin(bucket))
+        hi = start + int(np.argmax(bucket))
+        keep.extend((lo, hi) if lo <= hi else (hi, lo))
+
+    return np.unique(np.asarray(keep, dtype=np.int64))
+
+
+def downsample(x, y, n_out, method='lttb'):
+    """Reduce a line series to about ``n_out`` points; returns ``(x, y)`` arrays"""
+    if method not in METHODS:
+        raise ValueError(f"Unknown downsampling method {method!r}; expected one of {METHODS}")
+
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if len(y) <= n_out:
+        return x, y
+
+    indices = lttb_indices(x, y, n_out) if method == 'lttb' else minmax_indices(x, y, n_out)
+    return x[indices], y[indices]
+
+
+def visible_window(x, y, x_range):
+    """Slice a sorted series to ``x_range`` (inclusive), keeping one point either side"""
+    if x_range is None:
+        return x, y
+
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        lo, hi = (pd.Timestamp(v).to_datetime64() for v in x_range)
+    else:
+        lo, hi = (float(v) for v in x_range)
+    start = max(0, int(np.searchsorted(x, lo, side='left')) - 1)
+    stop = min(len(x), int(np.searchsorted(x, hi, side='right')) + 1)
+    return x[start:stop], np.asarray(y)[start:stop]
+
+
+def relayout_x_range(relayout_data):
+    """Extract the zoomed x-range from Plotly ``relayoutData`` (``None`` means full range)"""
+    if not relayout_data or relayout_data.get('xaxis.autorange'):
+        return None
+    if 'xaxis.range[0]' in relayout_data:
+        return (relayout_data['xaxis.range[0]'], relayout_data['xaxis.range[1]'])
+    if 'xaxis.range' in relayout_data:
+        return tuple(relayout_data['xaxis.range'])
+    return None
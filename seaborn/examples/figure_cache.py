@@ -0,0 +1,118 @@
+import functools
+import threading
+import time
+from collections import OrderedDict
+
+
+class FigureCache:
+    """Bounded LRU cache of serialized figures with TTL and data-version invalidation
+
+    Figures are stored as plain dicts (``fig.to_dict()``), which Dash returns
+    as-is without re-validating a ``go.Figure``.
+    """
+
+    def __init__(self, maxsize=128, ttl=300.0, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._versions = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Return the cached value or ``None`` when missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if self.ttl is None or expires > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._store(key, value)
+
+    def _store(self, key, value):
+        expires = None if self.ttl is None else self._clock() + self.ttl
+        self._entries[key] = (expires, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, name=None):
+        """Drop every entry, or only those produced by the function ``name``"""
+        with self._lock:
+            if name is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[0] == name]:
+                    del self._entries[key]
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / total if total else 0.0
+        }
+
+    def _check_version(self, name, version):
+        """Record a function's current data version, dropping entries built on older ones"""
+        with self._lock:
+            previous = self._versions.get(name, version)
+            self._versions[name] = version
+            if previous != version:
+                for key in [k for k in self._entries if k[0] == name and k[1] != version]:
+                    del self._entries[key]
+
+    def _put_current(self, name, version, key, value):
+        """``put`` unless the data version moved on while the figure was being built"""
+        with self._lock:
+            if self._versions.get(name, version) == version:
+                self._store(key, value)
+
+    def memoize(self, version=None):
+        """Decorator caching a figure-building function by its arguments
+
+        ``version`` is an optional zero-argument callable returning a token
+        that changes whenever the underlying data changes. The token is part
+        of the key, so a call still running on old data never fills the
+        entry that newer calls read.
+        """
+        def decorator(fn):
+            name = fn.__qualname__
+
+            @functools.wraps(fn)
+            def wrapper(*args):
+                token = None
+                if version is not None:
+                    token = version()
+                    self._check_version(name, token)
+                key = (name, token) + args
+                cached = self.get(key)
+                if cached is not None:
+                    return cached
+
+                fig = fn(*args)
+                value = fig.to_dict() if hasattr(fig, 'to_dict') else fig
+                self._put_current(name, token, key, value)
+                return value
+
+            wrapper.cache = self
+            return wrapper
+        return decorator
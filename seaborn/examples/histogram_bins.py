@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+
+def nice_bin_width(low, high, nbins):
+    """Round ``(high - low) / nbins`` up to 1, 2, 2.5 or 5 times a power of ten, like plotly's auto-binning"""
+    raw = (high - low) / max(nbins, 1)
+    if not np.isfinite(raw) or raw <= 0:
+        return 1.0
+    magnitude = 10 ** np.floor(np.log10(raw))
+    for step in (1, 2, 2.5, 5, 10):
+        if raw <= step * magnitude:
+            return float(step * magnitude)
+
+
+class GroupedHistogram:
+    """Histogram counts of ``value`` for every combination of the ``by`` columns
+
+    All groups share uniform bin edges, so the whole table is one small
+    ``groups x bins`` count array. ``append`` bins a batch of rows with NumPy
+    and adds it in; values outside the current edges widen the range by
+    whole bins, and adjacent bins are merged once there are more than
+    ``2 * nbins``. A lookup costs O(bins) however many rows have been counted.
+    """
+
+    def __init__(self, value, by, df=None, nbins=20):
+        self.value = value
+        self.by = list(by)
+        self.nbins = nbins
+        self.start = None
+        self.width = None
+        self.counts = np.zeros((0, 0), dtype=np.int64)
+        self._groups = {}
+        self.rows = 0
+        self.version = 0
+        if df is not None:
+            self.append(df)
+
+    @property
+    def edges(self):
+        return self.start + self.width * np.arange(self.counts.shape[1] + 1)
+
+    def _grow(self, low, high):
+        """Extend the edges by whole bins to cover ``[low, high]``"""
+        if self.start is None:
+            self.width = nice_bin_width(low, high, self.nbins)
+            self.start = np.floor(low / self.width) * self.width
+            n_bins = max(1, int(np.floor((high - self.start) / self.width)) + 1)
+            self.counts = np.zeros((len(self._groups), n_bins), dtype=np.int64)
+            return
+
+        left = max(0, int(np.ceil((self.start - low) / self.width)))
+        right = max(0, int(np.floor((high - self.start) / self.width)) + 1 - self.counts.shape[1])
+        if left or right:
+            self.counts = np.pad(self.counts, ((0, 0), (left, right)))
+            self.start -= left * self.width
+
+        # Keep the array small: merge bin pairs once the range has doubled
+        while self.counts.shape[1] > 2 * self.nbins:
+            left = int(round(self.start / self.width)) % 2
+            right = (self.counts.shape[1] + left) % 2
+            counts = np.pad(self.counts, ((0, 0), (left, right)))
+            self.counts = counts.reshape(counts.shape[0], -1, 2).sum(axis=2)
+            self.start -= left * self.width
+            self.width *= 2
+
+    def append(self, rows):
+        """Add a batch of rows to the counts in O(batch + groups x bins)"""
+        values = rows[self.value].to_numpy(dtype=np.float64)
+        keep = ~np.isnan(values)
+        if not keep.all():
+            rows, values = rows[keep], values[keep]
+
+        # Combined group code per row from per-column codes (categoricals are not re-hashed)
+        factors = [pd.factorize(rows[column], sort=False) for column in self.by]
+        shape = [max(1, len(uniques)) for _, uniques in factors]
+        keep = np.logical_and.reduce([codes >= 0 for codes, _ in factors])
+        combined = np.ravel_multi_index([codes[keep] for codes, _ in factors], shape)
+        values = values[keep]
+        present = np.flatnonzero(np.bincount(combined, minlength=int(np.prod(shape))))
+        group_of_code = np.zeros(int(np.prod(shape)), dtype=np.int64)
+        for code, position in zip(present, zip(*np.unravel_index(present, shape))):
+            key = tuple(uniques[i] for (_, uniques), i in zip(factors, position))
+            group_of_code[code] = self._groups.setdefault(key, len(self._groups))
+        if len(values) == 0:
+            return
+        if len(self._groups) > self.counts.shape[0]:
+            self.counts = np.pad(self.counts, ((0, len(self._groups) - self.counts.shape[0]), (0, 0)))
+
+        self._grow(values.min(), values.max())
+        n_bins = self.counts.shape[1]
+        bins = np.clip(((values - self.start) // self.width).astype(np.int64), 0, n_bins - 1)
+        flat = group_of_code[combined] * n_bins + bins
+        self.counts += np.bincount(flat, minlength=self.counts.size).reshape(self.counts.shape)
+        self.rows += len(values)
+        self.version += 1
+
+    def group_counts(self, *key):
+        """Counts per bin for one group (zeros for a group without rows)"""
+        row = self._groups.get(tuple(key))
+        if row is None:
+            return np.zeros(self.counts.shape[1], dtype=np.int64)
+        return self.counts[row]
+
+    def bar_trace(self, *key, **kwargs):
+        """The group's histogram as a prebuilt ``go.Bar`` with one bar per bin"""
+        edges = self.edges
+        return go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=self.group_counts(*key), width=self.width,
+                      customdata=np.column_stack([edges[:-1], edges[1:]]),
+                      hovertemplate='%{customdata[0]:.4g} - %{customdata[1]:.4g}<br>count=%{y}<extra></extra>',
+                      **kwargs)
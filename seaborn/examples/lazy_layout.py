@@ -0,0 +1,105 @@
+import os
+
+from dash import dcc, Input, Output
+from dash.exceptions import PreventUpdate
+
+from figure_cache import FigureCache
+
+# Resolves once the graph scrolls near the viewport (immediately without IntersectionObserver)
+WHEN_VISIBLE_JS = """
+function(graphId) {
+    return new Promise(function(resolve) {
+        var element = document.getElementById(graphId);
+        if (!element || !('IntersectionObserver' in window)) {
+            resolve(true);
+            return;
+        }
+        var observer = new IntersectionObserver(function(entries) {
+            if (entries.some(function(entry) { return entry.isIntersecting; })) {
+                observer.disconnect();
+                resolve(true);
+            }
+        }, {rootMargin: '200px'});
+        observer.observe(element);
+    });
+}
+"""
+
+
+def lazy_layout_enabled():
+    """Lazy mode is switched on with DASHBOARD_LAZY_LAYOUT=1"""
+    return os.environ.get('DASHBOARD_LAZY_LAYOUT', '').lower() in ('1', 'true', 'yes')
+
+
+def placeholder_figure(message="Loading chart..."):
+    """Empty figure shown until a lazy graph is filled in"""
+    return {
+        'data': [],
+        'layout': {
+            'xaxis': {'visible': False},
+            'yaxis': {'visible': False},
+            'plot_bgcolor': 'white',
+            'paper_bgcolor': 'white',
+            'annotations': [{
+                'text': message, 'showarrow': False,
+                'xref': 'paper', 'yref': 'paper', 'x': 0.5, 'y': 0.5,
+                'font': {'size': 14, 'color': '#6B7280'}
+            }]
+        }
+    }
+
+
+class LazyGraphs:
+    """Factory for ``dcc.Graph`` components that build their figure on first view
+
+    In eager mode the builder runs while the layout is defined, as before.
+    In lazy mode the graph starts as a placeholder; once it scrolls into view
+    a callback runs the builder. Either way the result is cached per worker
+    process and data version, and ``figure`` returns it for other callbacks.
+    """
+
+    def __init__(self, app, lazy=None, cache=None):
+        self.app = app
+        self.lazy = lazy_layout_enabled() if lazy is None else lazy
+        self.cache = cache or FigureCache(maxsize=32, ttl=None)
+        self.builders = {}
+
+    def graph(self, graph_id, builder, version=None, filled_by_callback=False, **graph_kwargs):
+        """Return a graph component; ``filled_by_callback`` marks graphs another callback fills
+
+        May be called on every page load (``app.layout`` as a function): the
+        builder is wrapped and its callback registered only the first time.
+        """
+        build = self.builders.get(graph_id)
+        if build is None:
+            build = self.builders[graph_id] = self.cache.memoize(version=version)(builder)
+            if self.lazy and not filled_by_callback:
+                self._register(graph_id, build)
+
+        if not self.lazy:
+            return dcc.Graph(id=graph_id, figure=build(), **graph_kwargs)
+        graph = dcc.Graph(id=graph_id, figure=placeholder_figure(), **graph_kwargs)
+        if filled_by_callback:
+            return graph
+
+        visible_id = f'{graph_id}-visible'
+        return dcc.Loading([graph, dcc.Store(id=visible_id)], type='circle')
+
+    def figure(self, graph_id):
+        """The graph's figure for the current data version, built at most once per version"""
+        return self.builders[graph_id]()
+
+    def _register(self, graph_id, build):
+        visible_id = f'{graph_id}-visible'
+
+        self.app.clientside_callback(
+            WHEN_VISIBLE_JS,
+            Output(visible_id, 'data'),
+            Input(graph_id, 'id')
+        )
+
+        @self.app.callback(Output(graph_id, 'figure'), Input(visible_id, 'data'))
+        def fill_graph(visible):
+            if not visible:
+                raise PreventUpdate
+            return build()
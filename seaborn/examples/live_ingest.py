@@ -0,0 +1,266 @@
+import io
+import os
+import threading
+import time
+from collections import deque, namedtuple
+
+import numpy as np
+import pandas as pd
+
+from data_engine import (CUSTOMER_DTYPES, SALES_DTYPES, apply_schema, category_mask,
+                         generate_customer_data, generate_sales_batch)
+from running_aggregates import AggregateStore
+from sufficient_stats import DensityGrid
+
+SALES_COLUMNS = ['date', 'sales', 'region', 'product', 'customer_type']
+CUSTOMER_COLUMNS = ['age', 'income', 'satisfaction', 'region', 'gender']
+
+
+class CsvTailSource:
+    """Reads rows appended to CSV files since the previous poll (like ``tail -f``)
+
+    Only complete lines are consumed; a partially written last line is picked
+    up on the next poll. The files need a header row.
+    """
+
+    def __init__(self, sales_path, customers_path=None):
+        self.paths = {'sales': sales_path, 'customers': customers_path}
+        self._offsets = {}
+        self._headers = {}
+
+    def _read_new(self, kind):
+        path = self.paths[kind]
+        if not path or not os.path.exists(path):
+            return None
+
+        offset = self._offsets.get(kind, 0)
+        if os.path.getsize(path) < offset:
+            offset = 0  # file was truncated or rotated
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            data = f.read()
+
+        end = data.rfind(b'\n') + 1
+        if end == 0:
+            return None
+        data = data[:end]
+        if offset == 0:
+            header, _, data = data.partition(b'\n')
+            self._headers[kind] = header
+        self._offsets[kind] = offset + end
+        if not data.strip():
+            return None
+
+        text = (self._headers[kind] + b'\n' + data).decode()
+        df = pd.read_csv(io.StringIO(text), parse_dates=['date'] if kind == 'sales' else False)
+        return apply_schema(df, SALES_DTYPES if kind == 'sales' else CUSTOMER_DTYPES)
+
+    def poll(self):
+        return self._read_new('sales'), self._read_new('customers')
+
+
+class SyntheticSource:
+    """Local stand-in for a live feed: each poll emits the next day of sales"""
+
+    def __init__(self, start_date, rows_per_day=4, customers_per_day=5, seed=None):
+        self.next_date = pd.Timestamp(start_date)
+        self.rows_per_day = rows_per_day
+        self.customers_per_day = customers_per_day
+        self._rng = np.random.default_rng(seed)
+
+    def poll(self):
+        sales = generate_sales_batch([self.next_date], self.rows_per_day, self._rng)
+        customers = generate_customer_data(self.customers_per_day, self._rng)
+        self.next_date += pd.Timedelta(days=1)
+        return sales, customers
+
+
+# One appended micro-batch; ``new_regions`` marks customers from a region not seen before
+_Batch = namedtuple('_Batch', 'version sales customers last_dates new_regions')
+
+
+class LiveIngestor:
+    """Appends micro-batches from a source to the dashboard's data in O(batch)
+
+    Every batch is folded into the sales cube, the running aggregates and
+    the customer age x income density grid, and kept in a bounded history
+    so clients can fetch only what they missed since their last ``version``.
+    """
+
+    def __init__(self, sales_df, customer_df, sales_cube, source=None, history=256):
+        self.source = source
+        self.version = 0
+        self.sales_version = 0
+        self.customers_version = 0
+        # Reentrant so ``snapshot`` callbacks can use the other readers
+        self._lock = threading.RLock()
+        self._poll_lock = threading.Lock()
+        self._thread = None
+        self._history = deque(maxlen=history)
+        self.reset(sales_df, customer_df, sales_cube)
+
+    def reset(self, sales_df, customer_df, sales_cube):
+        """Replace all data, e.g. with a newly published snapshot
+
+        The history is cleared, so every client redraws on its next tick.
+        """
+        # One full pass per snapshot; afterwards only batches are scanned
+        aggregates = AggregateStore()
+        aggregates.register('sales', 'sales', 'sales')
+        aggregates.register('sales_last_7d', 'sales', 'sales', window='7D')
+        aggregates.register('satisfaction', 'customers', 'satisfaction')
+        aggregates.append('sales', sales_df)
+        aggregates.append('customers', customer_df)
+        # Edges are fitted to the snapshot and grow by whole bins as later customers fall outside
+        density = DensityGrid.from_frame(customer_df, 'age', 'income')
+
+        with self._lock:
+            self.sales_cube = sales_cube
+            self.aggregates = aggregates
+            self.customer_density = density
+            self._sales_frames = [sales_df]
+            self._customer_frames = [customer_df]
+            self.customer_rows = len(customer_df)
+            self.customer_regions = set(customer_df['region'].dropna().unique())
+            self._history.clear()
+            self.version += 1
+            self.sales_version += 1
+            self.customers_version += 1
+
+    def poll(self):
+        """Pull one micro-batch from the source; returns the number of new sales rows"""
+        if self.source is None:
+            return 0
+        # Sources read and then advance their position; one poll at a time reads each row once
+        with self._poll_lock:
+            sales, customers = self.source.poll()
+            return self.append(sales, customers)
+
+    def start(self, interval):
+        """Poll the source every ``interval`` seconds from a daemon thread
+
+        Ingestion then runs once per process whatever the number of clients;
+        callbacks only read.
+        """
+        if self.source is None or self._thread is not None:
+            return
+
+        def run():
+            while True:
+                time.sleep(interval)
+                self.poll()
+
+        self._thread = threading.Thread(target=run, name='live-ingest', daemon=True)
+        self._thread.start()
+
+    def append(self, sales=None, customers=None):
+        with self._lock:
+            n_sales = 0 if sales is None else len(sales)
+            n_customers = 0 if customers is None else len(customers)
+            if n_sales == 0 and n_customers == 0:
+                return 0
+
+            last_dates = {}
+            if n_sales:
+                sales = sales[SALES_COLUMNS]
+                for key in sales.groupby(['region', 'product'], observed=True).groups:
+                    last_dates[key] = self.sales_cube.last_date(*key)
+                self.sales_cube.append(sales)
+                self._sales_frames.append(sales)
+                self.aggregates.append('sales', sales)
+                self.sales_version += 1
+
+            new_regions = False
+            if n_customers:
+                customers = customers[CUSTOMER_COLUMNS]
+                regions = set(customers['region'].dropna().unique())
+                new_regions = not regions <= self.customer_regions
+                self.customer_regions |= regions
+                self.customer_rows += n_customers
+                self._customer_frames.append(customers)
+                self.aggregates.append('customers', customers)
+                self.customer_density.update(customers)
+                self.customers_version += 1
+
+            self.version += 1
+            self._history.append(_Batch(self.version, sales if n_sales else None,
+                                        customers if n_customers else None, last_dates, new_regions))
+            return n_sales
+
+    def kpis(self):
+        """KPI card values, read from the running aggregates in O(1)"""
+        sales = self.aggregates.get('sales')
+        satisfaction = self.aggregates.get('satisfaction')
+        return {
+            'total_sales': sales['sum'],
+            # Every customer row, including those without a satisfaction score
+            'customers': self.customer_rows,
+            'avg_satisfaction': satisfaction['mean'] if satisfaction['count'] else 0.0,
+            'sales_rows': sales['count'],
+        }
+
+    def snapshot(self, build, *args):
+        """``(version, build(*args))`` with no batch landing while ``build`` runs"""
+        with self._lock:
+            return self.version, build(*args)
+
+    def batches_since(self, since_version):
+        """``(version, batches)``: the batches appended after ``since_version``, up to ``version``
+
+        ``batches`` is ``None`` when the client has to redraw instead: its
+        version fell out of the history or predates a reset.
+        """
+        with self._lock:
+            version = self.version
+            batches = [b for b in self._history if b.version > since_version]
+            if since_version != version and (not batches or batches[0].version != since_version + 1):
+                return version, None
+            return version, batches
+
+    def new_points(self, since_version, region, product):
+        """``(version, points)``: daily sums for one pair added after ``since_version``, up to ``version``
+
+        ``points`` is ``None`` when the client has to redraw instead: its
+        version fell out of the history, or new rows landed on dates it
+        already shows.
+        """
+        version, batches = self.batches_since(since_version)
+        if batches is None:
+            return version, None
+
+        key = (region, product)
+        frames = [b.sales[category_mask(b.sales['region'], region) & category_mask(b.sales['product'], product)]
+                  for b in batches if b.sales is not None]
+        rows = pd.concat(frames) if frames else pd.DataFrame(columns=SALES_COLUMNS)
+        if rows.empty:
+            return version, pd.DataFrame(columns=['date', 'sales'])
+
+        shown_until = next((b.last_dates[key] for b in batches if key in b.last_dates), None)
+        if shown_until is not None and rows['date'].min() <= shown_until:
+            return version, None
+        return version, rows.groupby('date')['sales'].sum().reset_index()
+
+    def _frame(self, frames):
+        if len(frames) > 1:
+            frames[:] = [pd.concat(frames, ignore_index=True)]
+        return frames[0]
+
+    def sales_frame(self):
+        """The full sales table, concatenating pending batches only when asked for"""
+        with self._lock:
+            return self._frame(self._sales_frames)
+
+    def customer_frame(self):
+        """The full customer table, concatenating pending batches only when asked for"""
+        with self._lock:
+            return self._frame(self._customer_frames)
+
+
+def source_from_env(sales_df):
+    """Build the live source named by DASHBOARD_LIVE_SOURCE ('synthetic' or a CSV path)"""
+    spec = os.environ.get('DASHBOARD_LIVE_SOURCE')
+    if not spec:
+        return None
+    if spec == 'synthetic':
+        return SyntheticSource(sales_df['date'].max() + pd.Timedelta(days=1))
+    return CsvTailSource(spec, os.environ.get('DASHBOARD_LIVE_CUSTOMERS'))
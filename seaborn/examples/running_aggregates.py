@@ -0,0 +1,159 @@
+import threading
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+
+class RunningStats:
+    """Count, sum, mean, variance, min and max maintained in O(batch)
+
+    Batches are combined with Chan et al.'s parallel update, so results match
+    a full-column reduction without keeping the values. NaNs are skipped.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+        batch = RunningStats()
+        batch.count = len(values)
+        batch.total = float(values.sum())
+        batch.mean = batch.total / batch.count
+        batch.m2 = float(((values - batch.mean) ** 2).sum())
+        batch.min, batch.max = float(values.min()), float(values.max())
+        return self.merge(batch)
+
+    def merge(self, other):
+        if other.count == 0:
+            return self
+        n = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / n
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / n
+        self.count = n
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def variance(self):
+        """Sample variance (ddof=1), like ``Series.var``"""
+        return self.m2 / (self.count - 1) if self.count > 1 else np.nan
+
+    @property
+    def std(self):
+        return float(np.sqrt(self.variance))
+
+    def snapshot(self):
+        empty = self.count == 0
+        return {
+            'count': self.count,
+            'sum': self.total,
+            'mean': np.nan if empty else self.mean,
+            'variance': self.variance,
+            'min': np.nan if empty else self.min,
+            'max': np.nan if empty else self.max,
+        }
+
+
+class WindowedStats:
+    """``RunningStats`` over a trailing time window, kept as per-bucket summaries
+
+    Values are grouped into ``bucket``-wide slots; slots older than ``window``
+    behind the newest timestamp are dropped, so a snapshot merges a bounded
+    number of summaries however many rows have streamed through.
+    """
+
+    def __init__(self, window, bucket='1D'):
+        self.window = pd.Timedelta(window)
+        self.bucket = pd.Timedelta(bucket)
+        self._buckets = deque()
+
+    def update(self, values, timestamps):
+        frame = pd.DataFrame({'value': np.asarray(values, dtype=np.float64),
+                              'slot': pd.DatetimeIndex(timestamps).floor(self.bucket)})
+        for slot, group in frame.groupby('slot'):
+            if self._buckets and self._buckets[-1][0] == slot:
+                self._buckets[-1][1].update(group['value'].to_numpy())
+                continue
+            stats = RunningStats().update(group['value'].to_numpy())
+            if self._buckets and slot < self._buckets[-1][0]:
+                # Late rows: fold into their slot, or insert it in order
+                slots = [s for s, _ in self._buckets]
+                i = int(np.searchsorted(np.array(slots, dtype='datetime64[ns]'), slot.to_datetime64()))
+                if i < len(slots) and slots[i] == slot:
+                    self._buckets[i][1].merge(stats)
+                else:
+                    self._buckets.insert(i, (slot, stats))
+            else:
+                self._buckets.append((slot, stats))
+        self._evict()
+        return self
+
+    def _evict(self):
+        if not self._buckets:
+            return
+        cutoff = self._buckets[-1][0] + self.bucket - self.window
+        while self._buckets and self._buckets[0][0] < cutoff:
+            self._buckets.popleft()
+
+    def stats(self):
+        merged = RunningStats()
+        for _, stats in self._buckets:
+            merged.merge(stats)
+        return merged
+
+    def snapshot(self):
+        return self.stats().snapshot()
+
+
+class AggregateStore:
+    """Named running aggregates over the columns of appended frames
+
+    ``register`` declares an aggregate (optionally time-windowed) on a
+    column of a named frame; ``append`` feeds a batch of that frame to every
+    aggregate declared on it; ``get`` serves a snapshot in O(1).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._specs = {}
+        self._stats = {}
+
+    def register(self, name, frame, column, window=None, time_column='date', bucket='1D'):
+        with self._lock:
+            self._specs[name] = (frame, column, window, time_column)
+            self._stats[name] = RunningStats() if window is None else WindowedStats(window, bucket)
+
+    def append(self, frame, df):
+        """Update every aggregate declared on ``frame`` with the batch ``df``"""
+        if df is None or len(df) == 0:
+            return
+        with self._lock:
+            for name, (source, column, window, time_column) in self._specs.items():
+                if source != frame:
+                    continue
+                values = df[column].to_numpy()
+                if window is None:
+                    self._stats[name].update(values)
+                else:
+                    self._stats[name].update(values, df[time_column])
+
+    def get(self, name):
+        """Snapshot dict (count, sum, mean, variance, min, max) of one aggregate"""
+        with self._lock:
+            return self._stats[name].snapshot()
+
+    def names(self):
+        return list(self._specs)
@@ -0,0 +1,81 @@
+import pandas as pd
+
+
+class SalesCube:
+    """Pre-aggregated sales indexed by region x product x date
+
+    Built once from the sales table and updated with ``append`` as new rows
+    arrive, so callbacks answer by lookup instead of scanning every row.
+    """
+
+    def __init__(self, sales_df=None):
+        self._trends = {}
+        self._daily = pd.Series(dtype='float64')
+        self._region_totals = {}
+        self._product_totals = {}
+        self.rows = 0
+        self.version = 0
+        if sales_df is not None:
+            self.append(sales_df)
+
+    @staticmethod
+    def _merge(existing, new):
+        """Add ``new`` daily sums onto ``existing``, appending in place of a full re-align when possible"""
+        if existing is None or existing.empty:
+            return new
+        if new.index[0] > existing.index[-1]:
+            return pd.concat([existing, new])
+        return existing.add(new, fill_value=0)
+
+    @staticmethod
+    def _add_totals(totals, grouped):
+        for key, value in grouped.items():
+            totals[key] = totals.get(key, 0.0) + value
+
+    def append(self, rows):
+        """Fold a batch of sales rows into the cube in O(batch) grouping work"""
+        if len(rows) == 0:
+            return
+
+        cells = rows.groupby(['region', 'product', 'date'], observed=True)['sales'].sum()
+        for (region, product), series in cells.groupby(level=[0, 1], observed=True):
+            key = (region, product)
+            self._trends[key] = self._merge(self._trends.get(key), series.droplevel([0, 1]))
+
+        self._daily = self._merge(self._daily, rows.groupby('date')['sales'].sum())
+        self._add_totals(self._region_totals, rows.groupby('region', observed=True)['sales'].sum())
+        self._add_totals(self._product_totals, rows.groupby('product', observed=True)['sales'].sum())
+        self.rows += len(rows)
+        self.version += 1
+
+    def trend(self, region, product):
+        """Daily sales for one region/product pair as a ``date, sales`` frame"""
+        series = self._trends.get((region, product))
+        if series is None:
+            return pd.DataFrame({'date': pd.Series(dtype='datetime64[ns]'), 'sales': pd.Series(dtype='float64')})
+        return series.rename_axis('date').rename('sales').reset_index()
+
+    def last_date(self, region, product):
+        """Latest date with sales for a pair, or ``None``"""
+        series = self._trends.get((region, product))
+        return None if series is None or series.empty else series.index[-1]
+
+    def cells(self):
+        """Every region/product/date cell as a ``region, product, date, sales`` frame"""
+        frames = [self.trend(region, product).assign(region=region, product=product)
+                  for region, product in sorted(self._trends)]
+        if not frames:
+            return pd.DataFrame(columns=['region', 'product', 'date', 'sales'])
+        return pd.concat(frames, ignore_index=True)[['region', 'product', 'date', 'sales']]
+
+    def daily_totals(self):
+        """Daily sales across every region and product"""
+        return self._daily.rename_axis('date').rename('sales').reset_index()
+
+    def region_totals(self):
+        """Total sales per region, sorted by region name"""
+        return pd.DataFrame(sorted(self._region_totals.items()), columns=['region', 'sales'])
+
+    def product_totals(self):
+        """Total sales per product, sorted by product name"""
+        return pd.DataFrame(sorted(self._product_totals.items()), columns=['product', 'sales'])
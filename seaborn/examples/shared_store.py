@@ -0,0 +1,167 @@
+"""Publish DataFrames once and attach to them zero-copy from many worker processes
+
+A loader process writes every frame as memory-mapped column files (see
+``dataset_store.write_columns``) into a new version directory under ``root``
+and then atomically points ``root/CURRENT`` at it. Workers map the columns
+read-only, so the operating system keeps a single copy in the page cache
+however many workers attach. On Linux the default root lives in ``/dev/shm``,
+so the columns are held in shared memory and never touch the disk.
+
+Workers poll the few bytes of ``CURRENT`` (``SharedFrames.poll`` or the
+``watch`` thread) to learn that a new version was published.
+
+Run ``python shared_store.py [--sales-rows N] [--customers N] [--every SECONDS]``
+to publish the dashboard data, then start the dashboard workers with
+``DASHBOARD_SHARED_STORE=1`` (or the store path).
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import pandas as pd
+
+from dataset_store import CacheError, read_columns, write_columns
+
+POINTER = 'CURRENT'
+DEFAULT_ROOT = os.path.join('/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir(),
+                            'dashboard_store')
+
+
+def store_root_from_env():
+    """Store root named by DASHBOARD_SHARED_STORE ('1' for the default root), or ``None``"""
+    spec = os.environ.get('DASHBOARD_SHARED_STORE', '')
+    if spec.lower() in ('', '0', 'false', 'no'):
+        return None
+    return DEFAULT_ROOT if spec.lower() in ('1', 'true', 'yes') else spec
+
+
+def current_version(root):
+    """Name of the published version directory, or ``None`` before the first publish"""
+    try:
+        with open(os.path.join(root, POINTER)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def _shareable(df):
+    # String columns become categoricals so their codes can be mapped too
+    strings = [c for c in df.columns
+               if pd.api.types.is_string_dtype(df[c]) and not isinstance(df[c].dtype, pd.CategoricalDtype)]
+    return df.astype({c: 'category' for c in strings}) if strings else df
+
+
+def publish(frames, root=DEFAULT_ROOT, keep=2):
+    """Write ``frames`` ({name: DataFrame}) as a new version and make it current
+
+    Older versions beyond ``keep`` are removed; workers that still map them
+    keep working until they re-attach, since open mappings outlive the files.
+    """
+    os.makedirs(root, exist_ok=True)
+    previous = current_version(root)
+    number = int(previous[1:]) + 1 if previous else 1
+    version = f'v{number:06d}'
+    directory = os.path.join(root, version)
+
+    for name, df in frames.items():
+        write_columns(_shareable(df), os.path.join(directory, name),
+                      extra={'version': version, 'published': time.time()})
+
+    tmp = os.path.join(root, POINTER + '.tmp')
+    with open(tmp, 'w') as f:
+        f.write(version)
+    os.replace(tmp, os.path.join(root, POINTER))
+
+    versions = sorted(d for d in os.listdir(root) if d.startswith('v') and d != version)
+    for old in versions[:max(0, len(versions) - keep + 1)]:
+        shutil.rmtree(os.path.join(root, old), ignore_errors=True)
+    return version
+
+
+class SharedFrames:
+    """Read-only, memory-mapped view of the frames of the current published version"""
+
+    def __init__(self, root=DEFAULT_ROOT, wait=None):
+        self.root = root
+        self.version = None
+        self.frames = {}
+        self._lock = threading.Lock()
+        self._listeners = []
+
+        deadline = None if wait is None else time.monotonic() + wait
+        while not self.poll():
+            if deadline is None or time.monotonic() > deadline:
+                raise CacheError(f"Nothing published in {root}; run shared_store.py first")
+            time.sleep(0.2)
+
+    def _attach(self, version):
+        directory = os.path.join(self.root, version)
+        names = sorted(d for d in os.listdir(directory) if os.path.isdir(os.path.join(directory, d)))
+        frames = {}
+        for name in names:
+            frames[name] = read_columns(os.path.join(directory, name), mmap=True)
+        return frames
+
+    def poll(self):
+        """Attach to a newly published version; returns whether one was found"""
+        version = current_version(self.root)
+        if version is None or version == self.version:
+            return False
+        try:
+            frames = self._attach(version)
+        except (CacheError, OSError):
+            return False  # removed or replaced while attaching; retried on the next poll
+
+        with self._lock:
+            self.version, self.frames = version, frames
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener(version, frames)
+        return True
+
+    def __getitem__(self, name):
+        return self.frames[name]
+
+    def watch(self, listener, interval=1.0):
+        """Call ``listener(version, frames)`` from a daemon thread on every new version"""
+        with self._lock:
+            self._listeners.append(listener)
+            start = len(self._listeners) == 1
+        if start:
+            def run():
+                while True:
+                    time.sleep(interval)
+                    self.poll()
+
+            threading.Thread(target=run, name='shared-store-watch', daemon=True).start()
+
+
+def main():
+    from data_engine import DEFAULT_CUSTOMERS, DEFAULT_SEED, generate_sample_data
+
+    parser = argparse.ArgumentParser(description='Publish the dashboard data for DASHBOARD_SHARED_STORE workers')
+    parser.add_argument('--root', default=store_root_from_env() or DEFAULT_ROOT)
+    parser.add_argument('--sales-rows', type=int, default=None)
+    parser.add_argument('--customers', type=int, default=DEFAULT_CUSTOMERS)
+    parser.add_argument('--every', type=float, default=None,
+                        help='republish freshly generated data every N seconds')
+    args = parser.parse_args()
+
+    seed = DEFAULT_SEED
+    while True:
+        start = time.perf_counter()
+        sales_df, customer_df = generate_sample_data(args.sales_rows, args.customers, seed)
+        version = publish({'sales': sales_df, 'customers': customer_df}, args.root)
+        print(f"published {version} to {args.root}: {len(sales_df):,} sales rows, "
+              f"{len(customer_df):,} customers in {time.perf_counter() - start:.2f} s")
+        if args.every is None:
+            break
+        time.sleep(args.every)
+        seed += 1
+
+
+if __name__ == '__main__':
+    main()
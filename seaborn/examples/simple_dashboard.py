@@ -1,18 +1,38 @@
 import dash
-from dash import dcc, html, Input, Output
+from dash import dcc, html, Input, Output, ClientsideFunction
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
-import seaborn as sns
+from callback_metrics import instrument_from_env, phase
+from callback_pool import run_on_pool_from_env
+from client_filter import choose_filter_mode, encode_frame, figure_template
+from dataset_store import load_dataset
+from figure_cache import FigureCache
+from histogram_bins import GroupedHistogram
+from lazy_layout import LazyGraphs
+from sufficient_stats import CoMoments
+from wire_format import compress_responses_from_env
 
-# Load sample data
-tips = sns.load_dataset('tips')
-iris = sns.load_dataset('iris')
+# Load sample data from the local binary cache (no network access needed)
+tips = load_dataset('tips')
+iris = load_dataset('iris')
+
+# Bill histograms for every day x sex, binned once; callbacks only look them up
+bill_histograms = GroupedHistogram('total_bill', ['day', 'sex'], tips, nbins=20)
+
+# Iris correlation from co-moments; new batches fold in with iris_moments.update(rows)
+iris_moments = CoMoments(iris.select_dtypes(include=[np.number]).columns).update(iris)
 
 # Initialize Dash app
 app = dash.Dash(__name__)
 
+# Serialized callback figures, invalidated whenever the tips frame changes
+figure_cache = FigureCache(maxsize=64, ttl=600)
+
+# Graphs are built while defining the layout, or on first view with DASHBOARD_LAZY_LAYOUT=1
+lazy_graphs = LazyGraphs(app)
+
 # Custom CSS with Tailwind-like classes
 app.index_string = '''
 <!DOCTYPE html>
@@ -75,8 +95,7 @@ def create_tips_scatter():
 
 def create_iris_heatmap():
     """Create iris correlation heatmap"""
-    numeric_cols = iris.select_dtypes(include=[np.number]).columns
-    corr_matrix = iris[numeric_cols].corr()
+    corr_matrix = iris_moments.corr()
     
     fig = px.imshow(
         corr_matrix,
@@ -107,6 +126,34 @@ def create_tips_boxplot():
     )
     return fig
 
+def create_bill_histogram(selected_day, selected_gender):
+    """Bill histogram of one day/gender pair from the precomputed counts"""
+    fig = go.Figure(bill_histograms.bar_trace(selected_day, selected_gender, marker_color='#636EFA'))
+    fig.update_layout(
+        title=f"💳 Bill Distribution - {selected_day} ({selected_gender})",
+        xaxis_title='Total Bill ($)',
+        yaxis_title='Frequency',
+        bargap=0,
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        font=dict(size=12),
+        title_font_size=16,
+        height=400
+    )
+    return fig
+
+def tips_filter_payload():
+    """Filter columns, bin edges and an empty histogram, for filtering in the browser"""
+    payload = encode_frame(tips[['day', 'sex', 'total_bill']])
+    payload['bins'] = {'start': bill_histograms.start, 'width': bill_histograms.width,
+                       'n': int(bill_histograms.counts.shape[1])}
+    payload['figure'] = figure_template(create_bill_histogram(tips['day'].iloc[0], tips['sex'].iloc[0]))
+    return payload
+
+# Small data is shipped once and filtered clientside (DASHBOARD_FILTER_MODE=auto|client|server)
+tips_payload = tips_filter_payload()
+DYNAMIC_FILTER_MODE = choose_filter_mode(tips_payload)
+
 # App layout
 app.layout = html.Div([
     # Header
@@ -147,22 +194,22 @@ app.layout = html.Div([
     # Charts Row 1
     html.Div([
         html.Div([
-            dcc.Graph(figure=create_sales_chart())
+            lazy_graphs.graph('sales-chart', create_sales_chart)
         ], className="w-full lg:w-1/2 p-4 bg-white rounded-lg shadow-md mb-4"),
         
         html.Div([
-            dcc.Graph(figure=create_tips_scatter())
+            lazy_graphs.graph('tips-scatter', create_tips_scatter)
         ], className="w-full lg:w-1/2 p-4 bg-white rounded-lg shadow-md mb-4")
     ], className="flex flex-wrap"),
     
     # Charts Row 2
     html.Div([
         html.Div([
-            dcc.Graph(figure=create_iris_heatmap())
+            lazy_graphs.graph('iris-heatmap', create_iris_heatmap)
         ], className="w-full lg:w-1/2 p-4 bg-white rounded-lg shadow-md mb-4"),
         
         html.Div([
-            dcc.Graph(figure=create_tips_boxplot())
+            lazy_graphs.graph('tips-boxplot', create_tips_boxplot)
         ], className="w-full lg:w-1/2 p-4 bg-white rounded-lg shadow-md mb-4")
     ], className="flex flex-wrap"),
     
@@ -195,7 +242,8 @@ app.layout = html.Div([
     # Dynamic Chart
     html.Div([
         html.H3("📊 Dynamic Visualization", className="text-2xl font-bold text-gray-800 mb-4 text-center"),
-        dcc.Graph(id='dynamic-chart')
+        dcc.Graph(id='dynamic-chart'),
+        dcc.Store(id='tips-data', data=tips_payload if DYNAMIC_FILTER_MODE == 'client' else None)
     ], className="bg-white rounded-lg shadow-md p-6 mb-8"),
     
     # Footer
@@ -207,29 +255,36 @@ app.layout = html.Div([
 ], className="min-h-screen bg-gray-100 p-4")
 
 # Callback for dynamic chart
-@app.callback(
-    Output('dynamic-chart', 'figure'),
-    [Input('day-dropdown', 'value'),
-     Input('gender-dropdown', 'value')]
-)
+@figure_cache.memoize(version=lambda: bill_histograms.version)
 def update_dynamic_chart(selected_day, selected_gender):
-    filtered_tips = tips[(tips['day'] == selected_day) & (tips['sex'] == selected_gender)]
-    
-    fig = px.histogram(
-        filtered_tips, x='total_bill', nbins=20,
-        title=f"💳 Bill Distribution - {selected_day} ({selected_gender})",
-        labels={'total_bill': 'Total Bill ($)', 'count': 'Frequency'}
-    )
-    fig.update_layout(
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        font=dict(size=12),
-        title_font_size=16,
-        height=400
-    )
+    with phase('figure'):
+        fig = create_bill_histogram(selected_day, selected_gender)
     
     return fig
 
+if DYNAMIC_FILTER_MODE == 'client':
+    # Dropdown changes are answered in the browser from the shipped columns
+    app.clientside_callback(
+        ClientsideFunction(namespace='client_filter', function_name='billHistogram'),
+        Output('dynamic-chart', 'figure'),
+        [Input('day-dropdown', 'value'),
+         Input('gender-dropdown', 'value'),
+         Input('tips-data', 'data')]
+    )
+else:
+    app.callback(
+        Output('dynamic-chart', 'figure'),
+        [Input('day-dropdown', 'value'),
+         Input('gender-dropdown', 'value')]
+    )(update_dynamic_chart)
+
+# Latency and payload metrics at /metrics (DASHBOARD_METRICS=1); registered last to see every callback
+instrument_from_env(app)
+# Callbacks on a bounded thread pool, latest selection wins (DASHBOARD_CALLBACK_WORKERS=<n>)
+run_on_pool_from_env(app)
+# gzip/brotli and ETag revalidation of responses (DASHBOARD_COMPRESS=0 disables)
+compress_responses_from_env(app)
+
 if __name__ == '__main__':
     print("🚀 Starting Dashboard...")
     print("📊 Open your browser to: http://localhost:8050")
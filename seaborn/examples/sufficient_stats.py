@@ -0,0 +1,206 @@
+"""Mergeable sufficient statistics for the correlation and density heatmaps
+
+* ``CoMoments`` keeps the count, column means and co-moment matrix
+  ``sum((x - mean)(x - mean)^T)`` of a set of numeric columns. Batches and
+  partitions combine with Chan et al.'s pairwise update, so ``corr()``
+  equals ``DataFrame.corr()`` without keeping the rows (rows with a NaN in
+  any of the columns are skipped).
+* ``DensityGrid`` counts points on uniform 2D bin edges, growing them by
+  whole bins when points fall outside. Grids with the same bin widths and
+  aligned edges merge by adding their counts.
+
+Both update in O(batch), and ``reduce_partitions`` computes them over
+partitions in a process pool and merges the results. Heatmaps then render
+from the state in O(columns^2) or O(bins) at any row count.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from histogram_bins import nice_bin_width
+
+
+class CoMoments:
+    """Count, means and co-moment matrix of ``columns``"""
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        k = len(self.columns)
+        self.count = 0
+        self.mean = np.zeros(k)
+        self.comoment = np.zeros((k, k))
+        self.version = 0
+
+    def update(self, df):
+        values = df[self.columns].to_numpy(dtype=np.float64)
+        values = values[~np.isnan(values).any(axis=1)]
+        if len(values) == 0:
+            return self
+        batch = CoMoments(self.columns)
+        batch.count = len(values)
+        batch.mean = values.mean(axis=0)
+        centered = values - batch.mean
+        batch.comoment = centered.T @ centered
+        return self.merge(batch)
+
+    def merge(self, other):
+        if other.columns != self.columns:
+            raise ValueError(f"Cannot merge co-moments of {other.columns} into {self.columns}")
+        if other.count == 0:
+            return self
+        n = self.count + other.count
+        delta = other.mean - self.mean
+        self.comoment = self.comoment + other.comoment + np.outer(delta, delta) * (self.count * other.count / n)
+        self.mean = self.mean + delta * (other.count / n)
+        self.count = n
+        self.version += 1
+        return self
+
+    def cov(self):
+        """Sample covariance (ddof=1), like ``DataFrame.cov``"""
+        scale = 1 / (self.count - 1) if self.count > 1 else np.nan
+        return pd.DataFrame(self.comoment * scale, index=self.columns, columns=self.columns)
+
+    def corr(self):
+        """Pearson correlation, like ``DataFrame.corr``"""
+        std = np.sqrt(np.diag(self.comoment))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            corr = np.clip(self.comoment / np.outer(std, std), -1, 1)
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+
+def uniform_edges(low, high, nbins):
+    """Bin edges of a nice width, aligned to it, covering ``[low, high]``"""
+    width = nice_bin_width(low, high, nbins)
+    start = np.floor(low / width) * width
+    n = max(1, int(np.floor((high - start) / width)) + 1)
+    return start + width * np.arange(n + 1)
+
+
+class DensityGrid:
+    """Point counts of ``x`` x ``y`` on uniform edges
+
+    Points outside the edges grow them by whole bin widths, so counts never
+    pile up in the border bins. Growth stops at ``max_bins`` per axis (a
+    guard against stray outliers); points beyond it are counted in
+    ``outside`` instead of being binned.
+    """
+
+    def __init__(self, x, y, x_edges, y_edges, max_bins=1000):
+        self.x, self.y = x, y
+        self.x_edges = np.asarray(x_edges, dtype=np.float64)
+        self.y_edges = np.asarray(y_edges, dtype=np.float64)
+        self.max_bins = max_bins
+        self.counts = np.zeros((len(self.x_edges) - 1, len(self.y_edges) - 1), dtype=np.int64)
+        self.outside = 0
+        self.version = 0
+
+    @classmethod
+    def from_frame(cls, df, x, y, nbins=(40, 40), max_bins=1000):
+        """Grid with edges fitted to ``df``'s ranges, filled with ``df``"""
+        edges = [uniform_edges(np.nanmin(df[c]), np.nanmax(df[c]), n) if len(df) else np.arange(n + 1.0)
+                 for c, n in zip((x, y), nbins)]
+        return cls(x, y, *edges, max_bins=max_bins).update(df)
+
+    @staticmethod
+    def _bins(values, edges):
+        return np.floor((values - edges[0]) / (edges[1] - edges[0])).astype(np.int64)
+
+    def _grow(self, axis, below, above):
+        """Add ``below`` bins before and ``above`` bins after the edges along ``axis``"""
+        if below == 0 and above == 0:
+            return
+        edges = self.x_edges if axis == 0 else self.y_edges
+        width = edges[1] - edges[0]
+        # Recomputed from the first edge, so repeated growth does not drift
+        edges = edges[0] + width * np.arange(-below, len(edges) + above)
+        if axis == 0:
+            self.x_edges = edges
+        else:
+            self.y_edges = edges
+        pad = [(0, 0), (0, 0)]
+        pad[axis] = (below, above)
+        self.counts = np.pad(self.counts, pad)
+
+    def _fit(self, axis, bins):
+        """Grow the axis to hold ``bins`` within ``max_bins``; returns the shifted bins and which fit"""
+        n = self.counts.shape[axis]
+        room = max(0, self.max_bins - n)
+        reachable = bins[(bins >= -room) & (bins < n + room)]
+        below = above = 0
+        if len(reachable):
+            below = min(room, max(0, -int(reachable.min())))
+            above = min(room - below, max(0, int(reachable.max()) - (n - 1)))
+        self._grow(axis, below, above)
+        bins = bins + below
+        return bins, (bins >= 0) & (bins < self.counts.shape[axis])
+
+    def update(self, df):
+        x = df[self.x].to_numpy(dtype=np.float64)
+        y = df[self.y].to_numpy(dtype=np.float64)
+        keep = ~(np.isnan(x) | np.isnan(y))
+        if not keep.any():
+            return self
+        ix, fits_x = self._fit(0, self._bins(x[keep], self.x_edges))
+        iy, fits_y = self._fit(1, self._bins(y[keep], self.y_edges))
+        fits = fits_x & fits_y
+        self.outside += int((~fits).sum())
+        nx, ny = self.counts.shape
+        self.counts += np.bincount(ix[fits] * ny + iy[fits], minlength=nx * ny).reshape(nx, ny)
+        self.version += 1
+        return self
+
+    @staticmethod
+    def _offset(edges, other_edges):
+        """Whole-bin offset of ``other_edges`` from ``edges``"""
+        width = edges[1] - edges[0]
+        if not np.isclose(other_edges[1] - other_edges[0], width):
+            raise ValueError("Density grids must share their bin widths to merge")
+        shift = (other_edges[0] - edges[0]) / width
+        if not np.isclose(shift, round(shift)):
+            raise ValueError("Density grids must have aligned bin edges to merge")
+        return int(round(shift))
+
+    def merge(self, other):
+        dx = self._offset(self.x_edges, other.x_edges)
+        dy = self._offset(self.y_edges, other.y_edges)
+        ox, oy = other.counts.shape
+        self._grow(0, max(0, -dx), max(0, dx + ox - self.counts.shape[0]))
+        self._grow(1, max(0, -dy), max(0, dy + oy - self.counts.shape[1]))
+        dx, dy = max(0, dx), max(0, dy)
+        self.counts[dx:dx + ox, dy:dy + oy] += other.counts
+        self.outside += other.outside
+        self.version += 1
+        return self
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    def heatmap_trace(self, **kwargs):
+        """The grid as a ``go.Heatmap`` (rows along y, like ``px.density_heatmap``)"""
+        return go.Heatmap(x=(self.x_edges[:-1] + self.x_edges[1:]) / 2,
+                          y=(self.y_edges[:-1] + self.y_edges[1:]) / 2,
+                          z=self.counts.T,
+                          hovertemplate=f'{self.x}=%{{x}}<br>{self.y}=%{{y}}<br>count=%{{z}}<extra></extra>',
+                          **kwargs)
+
+
+def _partition_state(make_state, load, task):
+    return make_state().update(load(task))
+
+
+def reduce_partitions(make_state, load, tasks, max_workers=None):
+    """Build ``make_state()`` over every partition in a process pool and merge the results
+
+    ``load(task)`` runs in the worker and returns that partition's frame, so
+    only the small states travel between processes. ``make_state`` and
+    ``load`` must be picklable (module-level functions or ``functools.partial``).
+    """
+    tasks = list(tasks)
+    with ProcessPoolExecutor(max_workers) as pool:
+        states = pool.map(_partition_state, [make_state] * len(tasks), [load] * len(tasks), tasks)
+        return reduce(lambda merged, state: merged.merge(state), states, make_state())
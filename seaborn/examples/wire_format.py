@@ -0,0 +1,196 @@
+"""Smaller responses on the wire: typed-array figures, gzip/brotli and ETag revalidation
+
+* ``typed_figure`` turns a figure's numeric trace arrays into base64 typed
+  arrays (``{'dtype': 'f4', 'bdata': ...}``), narrowing float64 to float32.
+  Needs a plotly.js that decodes typed arrays (2.28+); opt in with
+  DASHBOARD_TYPED_ARRAYS=1.
+* ``compress_responses`` gzip-compresses (brotli when the ``brotli`` package
+  is installed and accepted) text and JSON responses above ``min_bytes``,
+  reusing the compressed bytes of identical bodies.
+* Layout, dependency and callback responses carry an ETag of their body. A
+  request with a matching ``If-None-Match`` gets an empty 304: browsers
+  revalidate the layout on their own, and ``assets/etag_fetch.js`` does it
+  for callback requests by keeping the last response per output.
+
+Enabled by default; DASHBOARD_COMPRESS=0 turns compression and ETags off.
+"""
+import base64
+import gzip
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import flask
+import numpy as np
+
+from client_filter import encode_array
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE = ('application/json', 'application/javascript', 'text/javascript', 'text/html', 'text/css', 'text/plain')
+VALIDATED_PATHS = ('_dash-layout', '_dash-dependencies', '_dash-update-component')
+
+# Trace attributes holding per-point numbers worth encoding
+ARRAY_KEYS = ('x', 'y', 'z', 'customdata', 'value', 'values', 'lat', 'lon')
+MARKER_KEYS = ('color', 'size', 'opacity')
+
+
+def typed_arrays_setting():
+    return os.environ.get('DASHBOARD_TYPED_ARRAYS', '').lower() in ('1', 'true', 'yes')
+
+
+def _compact(value, min_length, float32):
+    """Typed-array form of a numeric array (plain or already typed), else ``value`` unchanged"""
+    if isinstance(value, dict) and 'bdata' in value:
+        if not (float32 and value.get('dtype') == 'f8') or 'shape' in value:
+            return value
+        # plotly >= 6 already encodes float64 arrays; narrow them
+        value = np.frombuffer(base64.b64decode(value['bdata']), dtype='<f8')
+    if isinstance(value, (list, tuple, np.ndarray)) and len(value) >= min_length:
+        array = np.asarray(value)
+        if array.ndim != 1 or array.dtype.kind not in 'iuf':
+            return value
+        if float32 and array.dtype == np.float64:
+            array = array.astype(np.float32)
+        return encode_array(array)
+    return value
+
+
+def typed_figure(figure, min_length=64, float32=True):
+    """Figure dict whose per-point numeric arrays are base64 typed arrays"""
+    figure = figure.to_dict() if hasattr(figure, 'to_dict') else dict(figure)
+    for trace in figure.get('data', []):
+        for key in ARRAY_KEYS:
+            if key in trace:
+                trace[key] = _compact(trace[key], min_length, float32)
+        marker = trace.get('marker')
+        if isinstance(marker, dict):
+            for key in MARKER_KEYS:
+                if key in marker:
+                    marker[key] = _compact(marker[key], min_length, float32)
+    return figure
+
+
+def _plain(value):
+    """Plain (nested) list form of a typed or NumPy array, else ``value`` unchanged"""
+    if isinstance(value, dict) and 'bdata' in value:
+        array = np.frombuffer(base64.b64decode(value['bdata']), dtype=np.dtype(value['dtype']).newbyteorder('<'))
+        if 'shape' in value:
+            array = array.reshape([int(n) for n in str(value['shape']).split(',')])
+        return array.tolist()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return value
+
+
+def plain_figure(figure):
+    """Figure dict whose per-point arrays are plain lists, so a ``Patch`` can extend them
+
+    dash-renderer's ``Extend`` concatenates onto arrays, not typed-array objects.
+    """
+    figure = figure.to_dict() if hasattr(figure, 'to_dict') else dict(figure)
+    for trace in figure.get('data', []):
+        for key in ARRAY_KEYS:
+            if key in trace:
+                trace[key] = _plain(trace[key])
+        marker = trace.get('marker')
+        if isinstance(marker, dict):
+            for key in MARKER_KEYS:
+                if key in marker:
+                    marker[key] = _plain(marker[key])
+    return figure
+
+
+def maybe_typed(figure):
+    """``typed_figure`` when DASHBOARD_TYPED_ARRAYS is on, else the figure as given"""
+    return typed_figure(figure) if typed_arrays_setting() else figure
+
+
+def body_etag(body):
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+def _encoding(accept):
+    accept = accept.lower()
+    if brotli is not None and 'br' in accept:
+        return 'br'
+    if 'gzip' in accept:
+        return 'gzip'
+    return None
+
+
+def _compress(body, encoding, level):
+    if encoding == 'br':
+        return brotli.compress(body, quality=min(level, 11))
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+class _CompressedBodies:
+    """Small LRU of compressed bodies keyed by (ETag, encoding)"""
+
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, body, encoding, level):
+        if key is None:
+            return _compress(body, encoding, level)
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                return data
+        data = _compress(body, encoding, level)
+        with self._lock:
+            self._entries[key] = data
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return data
+
+
+def compress_responses(app, min_bytes=1024, level=6):
+    """Add ETag revalidation and gzip/brotli compression to ``app``'s responses"""
+    compressed = _CompressedBodies()
+
+    @app.server.after_request
+    def compact_response(response):
+        if (response.status_code != 200 or response.direct_passthrough
+                or response.mimetype not in COMPRESSIBLE or 'Content-Encoding' in response.headers):
+            return response
+        request = flask.request
+        body = response.get_data()
+
+        tag = response.get_etag()[0]
+        if tag is None and request.path.rstrip('/').endswith(VALIDATED_PATHS):
+            tag = body_etag(body)
+            # Weak: the same tag is used for every content encoding of the body
+            response.set_etag(tag, weak=True)
+            if request.method == 'GET':
+                response.headers['Cache-Control'] = 'no-cache'
+            if request.if_none_match.contains_weak(tag):
+                response.status_code = 304
+                response.set_data(b'')
+                return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = _encoding(request.headers.get('Accept-Encoding', ''))
+        if encoding is None or len(body) < min_bytes:
+            return response
+        data = compressed.get((tag, encoding) if tag else None, body, encoding, level)
+        response.set_data(data)
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    return compressed
+
+
+def compress_responses_from_env(app):
+    """Compression and ETags unless DASHBOARD_COMPRESS=0"""
+    if os.environ.get('DASHBOARD_COMPRESS', '1').lower() in ('0', 'false', 'no'):
+        return None
+    return compress_responses(app, int(os.environ.get('DASHBOARD_COMPRESS_MIN_BYTES') or 1024))